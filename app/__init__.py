@@ -3,8 +3,13 @@
 from flask import Flask
 from config.settings import Config
 from flask_migrate import Migrate
-from utilities.helper import inspect_database
 from app.models import db, Currency, Record
+from app.cache import init_cache
+from app.metrics import init_metrics
+from app.data_version import init_data_version
+from app.replicas import init_replicas
+from app.bootstrap import init_bootstrap
+from app.commands import register_commands
 from flask_cors import CORS
 from app import routes
 
@@ -20,9 +25,19 @@ def create_app(config_class=Config):
 
     db.init_app(app)
     migrate.init_app(app, db)
+    init_cache(app)
+    init_metrics(app)
+    init_data_version(app)
+    init_replicas(app)
 
-    # Check the status of the database only if it's not the testing environment
-    inspect_database(app) if not app.config['TESTING'] else None  # Comment out before migration
+    # Load the data with "flask bootstrap", or in a background thread if enabled
+    init_bootstrap(app)
+    register_commands(app)
+
+    # Load the in-memory store if the dashboard is served from it (NumPy is only imported then)
+    if app.config['DASHBOARD_STORE'] == 'memory':
+        from app.store import store
+        store.init_app(app)
 
     app.register_blueprint(routes.bp)
 
@@ -0,0 +1,83 @@
+# app/analytics.py
+
+import numpy as np
+
+# Days per year the markets trade, to annualize the daily volatility
+TRADING_DAYS = 365
+
+# Builds the (days, currencies) close matrix of the days [start_date, start_date + days), NaN where a day has no record
+def close_matrix(records, currency_ids, start_date, days):
+    position_by_id = {currency_id: position for position, currency_id in enumerate(currency_ids)}
+    rows = np.fromiter(((record.date - start_date).days for record in records), dtype=np.int64, count=len(records))
+    columns = np.fromiter((position_by_id[record.currency_id] for record in records), dtype=np.int64, count=len(records))
+    closes = np.full((days, len(currency_ids)), np.nan)
+    closes[rows, columns] = np.fromiter((record.close for record in records), dtype=np.float64, count=len(records))
+    return closes
+
+# Daily log returns, NaN when either close is missing or not positive
+def log_returns(closes):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logs = np.log(np.where(closes > 0, closes, np.nan))
+    return np.diff(logs, axis=0)
+
+# Applies a reduction over the trailing windows of every column, the first period - 1 rows being NaN
+def rolling(values, period, reduce):
+    result = np.full(values.shape, np.nan)
+    if period <= len(values):
+        windows = np.lib.stride_tricks.sliding_window_view(values, period, axis=0)
+        result[period - 1:] = reduce(windows)
+    return result
+
+# Simple moving average of the closes over the period
+def sma(closes, period):
+    return rolling(closes, period, lambda windows: windows.mean(axis=-1))
+
+# Annualized standard deviation of the log returns over the period, aligned with the closes
+def volatility(closes, period):
+    returns = log_returns(closes)
+    daily = rolling(returns, period, lambda windows: windows.std(axis=-1, ddof=1))
+    return np.vstack([np.full((1, closes.shape[1]), np.nan), daily * np.sqrt(TRADING_DAYS)])
+
+# Exponential moving average of the closes (alpha = 2 / (period + 1)), seeded with the first close
+# and carried over the missing days; the recursion runs over the days, every currency at once
+def ema(closes, period):
+    alpha = 2 / (period + 1)
+    result = np.empty(closes.shape)
+    previous = np.full(closes.shape[1], np.nan)
+    for day, close in enumerate(closes):
+        previous = np.where(np.isnan(previous), close, np.where(np.isnan(close), previous, alpha * close + (1 - alpha) * previous))
+        result[day] = previous
+    return result
+
+# Pearson correlation of every pair of return columns over the days both have a return,
+# from a handful of matrix products instead of one pass per pair (NaN with less than 2 days or no variance)
+def correlation_matrix(returns):
+    present = (~np.isnan(returns)).astype(np.float64)
+    values = np.where(np.isnan(returns), 0.0, returns)
+
+    counts = present.T @ present
+    sums = values.T @ present  # sums[i, j]: returns of i on the days j has one
+    squares = (values * values).T @ present
+    products = values.T @ values
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products - sums * sums.T / counts
+        variance = squares - sums * sums / counts
+        correlation = covariance / np.sqrt(variance * variance.T)
+        # A constant column leaves rounding noise in place of a zero variance
+        constant = ~(variance > 1e-12 * squares)
+    correlation[(counts < 2) | constant | constant.T] = np.nan
+    return np.clip(correlation, -1, 1)
+
+# Converts an array to nested lists with NaN as None, ready for JSON
+def to_json(values):
+    return np.where(np.isnan(values), None, values).tolist()
+
+# Computes the analytics of the currencies from their close matrix
+def analyze(closes, period):
+    return {
+        'sma': to_json(sma(closes, period).T),
+        'ema': to_json(ema(closes, period).T),
+        'volatility': to_json(volatility(closes, period).T),
+        'correlation': to_json(correlation_matrix(log_returns(closes)))
+    }
@@ -0,0 +1,158 @@
+# app/asgi.py
+
+from urllib.parse import parse_qsl
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.cache import create_cache
+from app.data_version import DataVersionWatcher
+from app.routes import Context, dashboard_response, series_response, analytics_response, market_response, coverage_response, search_response, autocomplete_response, search_batch_response, liveness_response, readiness_response
+from app.search_index import SearchIndex
+from app.coverage import CoverageIndex
+from app.serialization import dumps, should_stream, iter_json
+
+# Async drivers of the supported databases
+ASYNC_DRIVERS = {'postgresql': 'asyncpg', 'sqlite': 'aiosqlite'}
+
+# Returns the database URI with the async driver of its backend
+def async_database_uri(config):
+    if config.get('ASYNC_DATABASE_URI'):
+        return config['ASYNC_DATABASE_URI']
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    backend = url.get_backend_name()
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+# Returns the pool settings of the async engine (SQLite uses its own single-file pools)
+def async_engine_options(config, uri):
+    if make_url(uri).get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_pre_ping': True
+    }
+
+# ASGI variant of the main blueprint, serving the same JSON contract on an async engine
+class AsyncApp:
+    def __init__(self, config_class):
+        self.config = {key: getattr(config_class, key) for key in dir(config_class) if key.isupper()}
+        uri = async_database_uri(self.config)
+        self.engine = create_async_engine(uri, **async_engine_options(self.config, uri))
+        self.cache = create_cache(self.config)
+        self.data_version = DataVersionWatcher(self.config['DATA_VERSION_CHECK_SECONDS'])
+        self.search_index = None
+        self.coverage_index = None
+        self.routes = {
+            '/dashboard': dashboard_response,
+            '/series': series_response,
+            '/analytics': analytics_response,
+            '/market': market_response,
+            '/coverage': coverage_response,
+            '/search': search_response,
+            '/search/autocomplete': autocomplete_response,
+            '/search/batch': search_batch_response,
+            '/cache': lambda args, context: (context.cache.stats(), 200),
+            '/readyz': readiness_response
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+
+        # Keep the first value of each parameter, as Flask's request.args.get does
+        args = {}
+        for key, value in parse_qsl(scope['query_string'].decode(), keep_blank_values=True):
+            args.setdefault(key, value)
+
+        handler = self.routes.get(scope['path'])
+        if scope['path'] == '/healthz':
+            # The liveness probe does not touch the database
+            response_data, status = liveness_response(args, None)
+        elif handler is readiness_response:
+            response_data, status = await self.probe(args)
+        elif handler is None:
+            response_data, status = {"error": "Bad request."}, 404
+        elif scope['method'] != 'GET':
+            response_data, status = {"error": "Method not allowed."}, 405
+        else:
+            response_data, status = await self.handle(handler, args)
+
+        headers = [(b'content-type', b'application/json'), (b'access-control-allow-origin', b'*')]
+
+        # Stream long lists chunk by chunk instead of encoding the whole body at once
+        if should_stream(response_data, self.config['JSON_STREAM_ROWS']):
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            for chunk in iter_json(response_data):
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        body = dumps(response_data)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers + [(b'content-length', str(len(body)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    # Runs the endpoint logic on a pooled async connection, yielding to other requests during DB waits
+    async def handle(self, handler, args):
+        async with self.engine.connect() as connection:
+            await self.sync_data_version(connection)
+            await self.prepare(connection)
+            context = Context(None, self.config, self.cache, lambda: self.search_index, lambda: self.coverage_index)
+            return await connection.run_sync(lambda sync_connection: handler(args, context._replace(connection=sync_connection)))
+
+    # Runs the readiness probe without the data version check and the in-memory structures,
+    # reporting a database that cannot be reached as unavailable
+    async def probe(self, args):
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(lambda sync_connection: readiness_response(args, Context(sync_connection, self.config, self.cache, None, None)))
+        except SQLAlchemyError as e:
+            return {"status": "unavailable", "error": str(e)}, 503
+
+    # Drops the cached responses and reloads the indexes and the in-memory store when the data changed
+    # since the last check, keeping them when the version cannot be read
+    async def sync_data_version(self, connection):
+        try:
+            changed = await connection.run_sync(self.data_version.check)
+        except SQLAlchemyError as e:
+            await connection.rollback()
+            print(f"[Server] Could not read the data version, keeping the cached data. Error: {e}")
+            return
+
+        if changed:
+            self.cache.clear()
+            self.search_index = None
+            self.coverage_index = None
+            if self.config['DASHBOARD_STORE'] == 'memory':
+                from app.store import store
+                if store.loaded:
+                    await connection.run_sync(store.reload)
+
+    # Loads the in-memory structures on first use
+    async def prepare(self, connection):
+        if self.search_index is None:
+            self.search_index = await connection.run_sync(SearchIndex.load)
+        if self.coverage_index is None:
+            self.coverage_index = await connection.run_sync(CoverageIndex.load)
+        if self.config['DASHBOARD_STORE'] == 'memory':
+            from app.store import store
+            if not store.loaded:
+                await connection.run_sync(store.load)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                async with self.engine.connect() as connection:
+                    await self.prepare(connection)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,73 @@
+# app/bootstrap.py
+
+import threading
+from datetime import datetime
+
+# Stages of the bootstrap during which the data is incomplete
+RUNNING_STAGES = ['checking', 'downloading', 'uploading', 'snapshot']
+
+class BootstrapStatus:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stage = 'idle'
+        self.message = None
+        self.files_done = 0
+        self.files_total = 0
+        self.started_at = None
+        self.finished_at = None
+
+    # Updates and reports the progress of the bootstrap
+    def update(self, stage=None, **fields):
+        with self.lock:
+            if stage is not None:
+                self.stage = stage
+            for name, value in fields.items():
+                setattr(self, name, value)
+            progress = f" ({self.files_done}/{self.files_total} files)" if self.stage == 'uploading' else ''
+        print(f"[Server] Bootstrap {self.stage}{progress}")
+
+    # Progress callback of read_files_and_upload
+    def file_done(self, files_done, files_total):
+        self.update(files_done=files_done, files_total=files_total)
+
+    @property
+    def running(self):
+        return self.stage in RUNNING_STAGES
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'stage': self.stage,
+                'message': self.message,
+                'files_done': self.files_done,
+                'files_total': self.files_total,
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None
+            }
+
+# Attaches the bootstrap status and starts the background bootstrap if enabled
+def init_bootstrap(app):
+    app.extensions['bootstrap'] = BootstrapStatus()
+    if app.config['BOOTSTRAP_IN_BACKGROUND'] and not app.config['TESTING']:
+        threading.Thread(target=run_background_bootstrap, args=(app,), name='bootstrap', daemon=True).start()
+
+# Checks the database and loads the data if it is empty, reporting progress in the app's status
+def run_bootstrap(app):
+    # Imported here as the ingestion dependencies are only needed by the bootstrap
+    from utilities.helper import inspect_database
+
+    status = app.extensions['bootstrap']
+    status.update('checking', message=None, started_at=datetime.utcnow(), finished_at=None)
+    try:
+        inspect_database(app, status)
+    except Exception as e:
+        status.update('failed', message=str(e), finished_at=datetime.utcnow())
+        raise
+    status.update('ready', finished_at=datetime.utcnow())
+
+# Runs the bootstrap in a thread, where failures are only reported
+def run_background_bootstrap(app):
+    try:
+        run_bootstrap(app)
+    except Exception as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,142 @@
+# app/cache.py
+
+import json
+import threading
+from collections import OrderedDict
+from time import monotonic
+from flask import current_app
+
+# Builds a cache key from the normalized parts of a query
+def cache_key(*parts):
+    return json.dumps(parts, separators=(',', ':'))
+
+class NullCache:
+    name = 'none'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    # Returns a (found, value) pair
+    def get(self, key):
+        self.misses += 1
+        return False, None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return 0
+
+    # Returns the hit/miss counters used to size the cache
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.name,
+            'size': self.size(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+class LRUCache(NullCache):
+    name = 'memory'
+
+    def __init__(self, max_size, ttl):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > monotonic():
+                # Mark the entry as the most recently used
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+
+            # Drop the expired entry, if any
+            self.entries.pop(key, None)
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+
+            # Evict the least recently used entries beyond the size bound
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def size(self):
+        return len(self.entries)
+
+class RedisCache(NullCache):
+    name = 'redis'
+
+    def __init__(self, url, ttl, client=None, prefix='krispyto'):
+        super().__init__()
+        if client is None:
+            # Only required when the Redis backend is configured
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    # Keys embed a generation shared by every task, so a clear is a single INCR
+    def versioned(self, key):
+        generation = int(self.client.get(f'{self.prefix}:generation') or 0)
+        return f'{self.prefix}:{generation}:{key}'
+
+    def get(self, key):
+        value = self.client.get(self.versioned(key))
+        if value is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, json.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self.versioned(key), json.dumps(value), ex=self.ttl)
+
+    def clear(self):
+        self.client.incr(f'{self.prefix}:generation')
+
+    # The number of shared entries is not tracked per task
+    def size(self):
+        return None
+
+# Creates the cache backend selected in the configuration
+def create_cache(config):
+    backend = config['CACHE_BACKEND']
+    if backend == 'memory':
+        return LRUCache(config['CACHE_SIZE'], config['CACHE_TTL'])
+    elif backend == 'redis':
+        return RedisCache(config['CACHE_REDIS_URL'], config['CACHE_TTL'])
+    return NullCache()
+
+# Attaches the configured cache to the app
+def init_cache(app):
+    cache = create_cache(app.config)
+    app.extensions['cache'] = cache
+    return cache
+
+# Returns the cache of the current app
+def get_cache():
+    return current_app.extensions['cache']
+
+# Drops every cached response after the data changed
+def invalidate_cache():
+    get_cache().clear()
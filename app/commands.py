@@ -0,0 +1,32 @@
+# app/commands.py
+
+import click
+from flask import current_app
+from app.bootstrap import run_bootstrap
+
+def register_commands(app):
+    # Downloads and loads the dataset if the database is empty (flask bootstrap)
+    @app.cli.command('bootstrap')
+    def bootstrap_command():
+        run_bootstrap(current_app._get_current_object())
+
+    # Removes every currency and record with one statement per table (flask reset-data)
+    @app.cli.command('reset-data')
+    @click.confirmation_option(prompt='Remove every currency and record?')
+    def reset_data_command():
+        # Imported here so the other commands do not load the ingestion
+        from utilities.helper import remove_all_data
+        try:
+            remove_all_data()
+        except Exception as e:
+            raise click.ClickException(f"The data could not be removed: {e}")
+
+    # Replaces the records of the currency of a CSV file in one transaction (flask replace-currency FILE)
+    @app.cli.command('replace-currency')
+    @click.argument('file_path', type=click.Path(exists=True, dir_okay=False))
+    def replace_currency_command(file_path):
+        from utilities.helper import replace_currency
+        try:
+            replace_currency(current_app._get_current_object(), file_path)
+        except Exception as e:
+            raise click.ClickException(f"The records of {file_path} could not be loaded: {e}")
@@ -0,0 +1,112 @@
+# app/coverage.py
+
+import json
+from bisect import bisect_right
+from datetime import date
+from flask import current_app
+from sqlalchemy import select
+from app.models import db, Currency, Coverage
+
+# Days of records a dashboard date needs, the days before it
+WINDOW_DAYS = 30
+
+# Merges ranges and single days (date ordinals) into sorted, disjoint and non-adjacent [first, last] ranges
+def merge_ranges(ranges, days=()):
+    merged = []
+    for first, last in sorted([*map(list, ranges), *([day, day] for day in days)]):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+# Converts ordinal ranges into [first, last] ISO dates
+def iso_ranges(ranges):
+    return [[date.fromordinal(first).isoformat(), date.fromordinal(last).isoformat()] for first, last in ranges]
+
+# Encodes ordinal ranges as stored in the coverage table, and back
+def encode_ranges(ranges):
+    return json.dumps(iso_ranges(ranges))
+
+def decode_ranges(text):
+    return [[date.fromisoformat(first).toordinal(), date.fromisoformat(last).toordinal()] for first, last in json.loads(text)]
+
+# Returns the ISO ranges of the dashboard dates with a full window, i.e. the dates following 30 consecutive days of records
+def dashboard_ranges(ranges):
+    return iso_ranges([first + WINDOW_DAYS, last + 1] for first, last in ranges if last - first + 1 >= WINDOW_DAYS)
+
+class CoverageIndex:
+    # Indexes the currencies given in id order with their encoded ranges (None if not covered yet)
+    def __init__(self, currencies):
+        self.entries = []
+        self.by_symbol = {}
+
+        for position, (name, symbol, ranges) in enumerate(currencies):
+            ranges = decode_ranges(ranges) if ranges else []
+            # Days covered up to the end of each range, to count the days of a window with one binary search
+            totals, total = [], 0
+            for first, last in ranges:
+                total += last - first + 1
+                totals.append(total)
+            self.entries.append({'crypto': name, 'symbol': symbol, 'ranges': ranges, 'starts': [first for first, _ in ranges], 'totals': totals})
+            self.by_symbol.setdefault(symbol.lower(), position)
+
+    # Reads every currency and its coverage from the database
+    @classmethod
+    def load(cls, connection=None):
+        query = select(Currency.name, Currency.symbol, Coverage.ranges).outerjoin(Coverage, Coverage.currency_id == Currency.id).order_by(Currency.id)
+        return cls((connection or db.session).execute(query).all())
+
+    # Returns the entries of the symbols (every currency for None), or None if a symbol does not exist
+    def find(self, crypto):
+        if crypto is None:
+            return self.entries
+        positions = [self.by_symbol.get(symbol.lower()) for symbol in crypto]
+        if None in positions:
+            return None
+        return [self.entries[position] for position in positions]
+
+    # Counts the days of an entry up to a day (ordinal), included
+    @staticmethod
+    def days_until(entry, day):
+        index = bisect_right(entry['starts'], day)
+        if index == 0:
+            return 0
+        last = entry['ranges'][index - 1][1]
+        return entry['totals'][index - 1] - max(last - day, 0)
+
+    # Whether every crypto has records on each of the 30 days before end_date
+    def has_window(self, crypto, end_date):
+        entries = self.find(crypto)
+        if entries is None:
+            return False
+        day = end_date.toordinal()
+        return all(self.days_until(entry, day - 1) - self.days_until(entry, day - WINDOW_DAYS - 1) >= WINDOW_DAYS for entry in entries)
+
+    # Returns the days with records and the dashboard dates of the cryptos, or None if a symbol does not exist
+    def ranges(self, crypto):
+        entries = self.find(crypto)
+        if entries is None:
+            return None
+        labels = crypto if crypto is not None else [entry['symbol'] for entry in entries]
+        return [{
+            'crypto': entry['crypto'],
+            'symbol': symbol,
+            'first': date.fromordinal(entry['ranges'][0][0]).isoformat() if entry['ranges'] else None,
+            'last': date.fromordinal(entry['ranges'][-1][1]).isoformat() if entry['ranges'] else None,
+            'ranges': iso_ranges(entry['ranges']),
+            'dashboard_ranges': dashboard_ranges(entry['ranges'])
+        } for symbol, entry in zip(labels, entries)]
+
+# Returns the coverage index of the current app, building it on first use
+def get_coverage_index():
+    index = current_app.extensions.get('coverage_index')
+    if index is None:
+        index = rebuild_coverage_index()
+    return index
+
+# Rebuilds the coverage index from the database (after the records changed)
+def rebuild_coverage_index():
+    index = CoverageIndex.load()
+    current_app.extensions['coverage_index'] = index
+    return index
@@ -0,0 +1,70 @@
+# app/data_version.py
+
+from time import monotonic
+from flask import current_app, request
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, DataVersion
+from app.cache import get_cache
+
+# Reads the version of the served data (0 before its first change)
+def read_data_version(connection):
+    return connection.execute(select(DataVersion.version).where(DataVersion.id == 1)).scalar() or 0
+
+class DataVersionWatcher:
+    # Follows the shared data version, reading it at most every check_seconds
+    def __init__(self, check_seconds):
+        self.check_seconds = check_seconds
+        self.version = None
+        self.checked_at = None
+
+    # Returns whether the data changed since the last check, in another process or in this one
+    def check(self, connection):
+        now = monotonic()
+        if self.checked_at is not None and now - self.checked_at < self.check_seconds:
+            return False
+        self.checked_at = now
+
+        version = read_data_version(connection)
+        changed = self.version is not None and version != self.version
+        self.version = version
+        return changed
+
+# Attaches the data version watcher to the app
+def init_data_version(app):
+    app.extensions['data_version'] = DataVersionWatcher(app.config['DATA_VERSION_CHECK_SECONDS'])
+
+# Probe endpoints, which answer while the database is down or not migrated yet
+PROBE_ENDPOINTS = {'main.liveness_probe', 'main.readiness_probe'}
+
+# Drops the cached responses and the search and coverage indexes of this process when another process
+# (e.g. "flask bootstrap") changed the data, the indexes being rebuilt on their next use, and reloads the in-memory store
+def sync_data_version():
+    if request.endpoint in PROBE_ENDPOINTS:
+        return
+
+    # Keep the current data when the version cannot be read, the request reporting the database error itself
+    try:
+        changed = current_app.extensions['data_version'].check(db.session)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"[Server] Could not read the data version, keeping the cached data. Error: {e}")
+        return
+
+    if changed:
+        get_cache().clear()
+        current_app.extensions.pop('search_index', None)
+        current_app.extensions.pop('coverage_index', None)
+        if current_app.config['DASHBOARD_STORE'] == 'memory':
+            from app.store import store
+            if store.loaded:
+                store.reload()
+
+# Bumps the shared data version after the data changed, this process being already up to date
+def bump_data_version():
+    if not db.session.execute(update(DataVersion).where(DataVersion.id == 1).values(version=DataVersion.version + 1)).rowcount:
+        db.session.add(DataVersion(id=1, version=1))
+    db.session.commit()
+
+    watcher = current_app.extensions['data_version']
+    watcher.version = read_data_version(db.session)
@@ -0,0 +1,158 @@
+# app/metrics.py
+
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from time import perf_counter
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# SQL statements and database time of the request handled by the current thread
+_current = threading.local()
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    # Returns the cumulative count of every bucket, ending with +Inf
+    def cumulative(self):
+        total, counts = 0, []
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+# Per-request and ingestion counters of one process, rendered in the Prometheus text format
+class Metrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.lock = threading.Lock()
+        self.buckets = buckets
+        self.requests = defaultdict(int)
+        self.latency = {}
+        self.db_statements = defaultdict(int)
+        self.db_seconds = defaultdict(float)
+        self.ingest_rows = 0
+        self.ingest_seconds = 0.0
+
+    def observe_request(self, endpoint, method, status, seconds, statements, db_seconds):
+        with self.lock:
+            self.requests[(endpoint, method, status)] += 1
+            if endpoint not in self.latency:
+                self.latency[endpoint] = Histogram(self.buckets)
+            self.latency[endpoint].observe(seconds)
+            self.db_statements[endpoint] += statements
+            self.db_seconds[endpoint] += db_seconds
+
+    def observe_ingest(self, rows, seconds):
+        with self.lock:
+            self.ingest_rows += rows
+            self.ingest_seconds += seconds
+
+    def render(self, cache_stats=None):
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{escape(label)}"' for key, label in labels)
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        with self.lock:
+            metric('krispyto_requests_total', 'counter', 'Requests handled per endpoint, method and status.', [
+                ((('endpoint', endpoint), ('method', method), ('status', status)), count)
+                for (endpoint, method, status), count in sorted(self.requests.items())
+            ])
+
+            lines.append('# HELP krispyto_request_duration_seconds Request latency per endpoint.')
+            lines.append('# TYPE krispyto_request_duration_seconds histogram')
+            for endpoint, histogram in sorted(self.latency.items()):
+                label = escape(endpoint)
+                counts = histogram.cumulative()
+                for bound, count in zip([*map(str, histogram.buckets), '+Inf'], counts):
+                    lines.append(f'krispyto_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {count}')
+                lines.append(f'krispyto_request_duration_seconds_sum{{endpoint="{label}"}} {histogram.sum}')
+                lines.append(f'krispyto_request_duration_seconds_count{{endpoint="{label}"}} {counts[-1]}')
+
+            metric('krispyto_db_statements_total', 'counter', 'SQL statements executed per endpoint.', [
+                ((('endpoint', endpoint),), count) for endpoint, count in sorted(self.db_statements.items())
+            ])
+            metric('krispyto_db_seconds_total', 'counter', 'Time spent in SQL statements per endpoint.', [
+                ((('endpoint', endpoint),), seconds) for endpoint, seconds in sorted(self.db_seconds.items())
+            ])
+            metric('krispyto_ingest_rows_total', 'counter', 'Records uploaded by the ingestion.', [((), self.ingest_rows)])
+            metric('krispyto_ingest_seconds_total', 'counter', 'Time spent uploading records.', [((), self.ingest_seconds)])
+
+        if cache_stats is not None:
+            backend = (('backend', cache_stats['backend']),)
+            metric('krispyto_cache_hits_total', 'counter', 'Cache lookups that found a response.', [(backend, cache_stats['hits'])])
+            metric('krispyto_cache_misses_total', 'counter', 'Cache lookups that missed.', [(backend, cache_stats['misses'])])
+            metric('krispyto_cache_hit_rate', 'gauge', 'Share of cache lookups that found a response.', [(backend, cache_stats['hit_rate'])])
+
+        return '\n'.join(lines) + '\n'
+
+# Escapes a label value of the Prometheus text format
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# Times every SQL statement, adding it to the request handled by the current thread if any
+def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault('query_started', []).append(perf_counter())
+
+def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - connection.info['query_started'].pop()
+    stats = getattr(_current, 'stats', None)
+    if stats is not None:
+        stats['statements'] += 1
+        stats['db_seconds'] += elapsed
+        if stats['queries'] is not None:
+            stats['queries'].append((elapsed, statement))
+
+# Attaches the metrics to the app and listens to the statements of every engine
+def init_metrics(app):
+    metrics = Metrics()
+    app.extensions['metrics'] = metrics
+    if app.config['METRICS_ENABLED'] and not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+    return metrics
+
+# Returns the metrics of the current app
+def get_metrics():
+    return current_app.extensions['metrics']
+
+# Starts measuring the current request
+def start_request():
+    if not current_app.config['METRICS_ENABLED']:
+        return
+    # The statements are only kept when they may be logged with a slow request
+    queries = [] if current_app.config['METRICS_SLOW_REQUEST_SECONDS'] > 0 else None
+    _current.stats = {'started': perf_counter(), 'statements': 0, 'db_seconds': 0.0, 'queries': queries}
+
+# Records the current request, logging it with its SQL if it was slow
+def finish_request(response):
+    stats = getattr(_current, 'stats', None)
+    if stats is None:
+        return response
+    _current.stats = None
+
+    elapsed = perf_counter() - stats['started']
+    get_metrics().observe_request(request.url_rule.rule, request.method, response.status_code, elapsed, stats['statements'], stats['db_seconds'])
+
+    threshold = current_app.config['METRICS_SLOW_REQUEST_SECONDS']
+    if threshold > 0 and elapsed >= threshold:
+        print(f"[Server] Slow request {request.method} {request.full_path} took {elapsed:.3f}s "
+              f"with {stats['statements']} SQL statement(s) in {stats['db_seconds']:.3f}s")
+        for seconds, statement in stats['queries']:
+            print(f"[Server]   {seconds:.3f}s {' '.join(statement.split())}")
+    return response
@@ -1,6 +1,7 @@
 # app/models.py
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func
 
 db = SQLAlchemy()
 
@@ -12,16 +13,68 @@ class Currency(db.Model):
     # Define a relationship to Record
     records = db.relationship('Record', back_populates='currency')
 
+    # Case-insensitive lookups by name and symbol (expression indexes work on PostgreSQL and SQLite alike)
+    __table_args__ = (
+        db.Index('ix_currency_lower_name', func.lower(name)),
+        db.Index('ix_currency_lower_symbol', func.lower(symbol)),
+    )
+
 class Record(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    currency_id = db.Column(db.Integer, db.ForeignKey('currency.id'))
-    date = db.Column(db.DateTime)
+    # One row per currency per day, keyed on (currency_id, date) so the days of a currency are one ordered index range
+    currency_id = db.Column(db.Integer, db.ForeignKey('currency.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
     high = db.Column(db.Float)
     low = db.Column(db.Float)
     open = db.Column(db.Float)
-    close = db.Column(db.Float)
+    close = db.Column(db.Float, nullable=False)
     volume = db.Column(db.Float)
     marketcap = db.Column(db.Float)
 
     # Define a relationship to Currency
-    currency = db.relationship('Currency', back_populates='records')
\ No newline at end of file
+    currency = db.relationship('Currency', back_populates='records')
+
+    # The table is partitioned by year on PostgreSQL, the partitions being created by the ingestion
+    __table_args__ = {'postgresql_partition_by': 'RANGE (date)'}
+
+
+class DailyMetric(db.Model):
+    # The date comes first in the primary key so a dashboard day is a single index range
+    date = db.Column(db.Date, primary_key=True)
+    currency_id = db.Column(db.Integer, db.ForeignKey('currency.id'), primary_key=True)
+    close = db.Column(db.Float)
+    change_24h = db.Column(db.Float)
+    change_7d = db.Column(db.Float)
+    change_1m = db.Column(db.Float)
+    volume = db.Column(db.Float)
+    marketcap = db.Column(db.Float)
+    full_window = db.Column(db.Boolean)
+
+class MarketMetric(db.Model):
+    # Market-wide aggregates of each day with records, so an overview over a date range is one primary key range read
+    date = db.Column(db.Date, primary_key=True)
+    total_marketcap = db.Column(db.Float)
+    total_volume = db.Column(db.Float)
+    currencies = db.Column(db.Integer)  # Currencies with a record on the day
+    top_marketcap = db.Column(db.Float)  # Market cap of the MARKET_TOP_N largest currencies
+    leader_id = db.Column(db.Integer, db.ForeignKey('currency.id'))  # Largest currency of the day
+    leader_marketcap = db.Column(db.Float)
+
+class IngestFile(db.Model):
+    # Manifest of the ingested CSV files, used to skip unchanged files and rows on a rerun
+    name = db.Column(db.String(255), primary_key=True)
+    content_hash = db.Column(db.String(64))
+    currency_id = db.Column(db.Integer, db.ForeignKey('currency.id'))
+    last_date = db.Column(db.DateTime)
+    ingested_at = db.Column(db.DateTime)
+
+class Coverage(db.Model):
+    # Days with records of each currency as run-length ranges, to validate a dashboard date without reading the records
+    currency_id = db.Column(db.Integer, db.ForeignKey('currency.id'), primary_key=True)
+    first_date = db.Column(db.Date)
+    last_date = db.Column(db.Date)
+    ranges = db.Column(db.Text)  # JSON list of [first, last] ISO dates
+
+class DataVersion(db.Model):
+    # Single row counting the changes of the served data, read by every process to drop what it derived from older data
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
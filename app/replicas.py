@@ -0,0 +1,74 @@
+# app/replicas.py
+
+import threading
+from time import monotonic
+from flask import current_app, g
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from app.models import db
+
+class ReplicaRouter:
+    # Creates one engine per read replica URI, a replica being skipped for retry_seconds after it failed
+    def __init__(self, uris, retry_seconds):
+        self.engines = [create_engine(uri, pool_pre_ping=True) for uri in uris]
+        self.retry_seconds = retry_seconds
+        self.down_until = [0.0] * len(uris)
+        self.position = 0
+        self.lock = threading.Lock()
+
+    # Returns the positions of the replicas to try, starting from the next one in round-robin order
+    def candidates(self):
+        with self.lock:
+            start = self.position
+            self.position = (start + 1) % len(self.engines)
+        now = monotonic()
+        positions = [(start + offset) % len(self.engines) for offset in range(len(self.engines))]
+        return [position for position in positions if self.down_until[position] <= now]
+
+    # Opens a connection to the next healthy replica, or returns None when every replica is down
+    def connect(self):
+        for position in self.candidates():
+            try:
+                return self.engines[position].connect()
+            except DBAPIError as e:
+                self.down_until[position] = monotonic() + self.retry_seconds
+                print(f"[Server] Replica {position} is unavailable, skipping it for {self.retry_seconds}s. Error: {e.orig}")
+        return None
+
+    # Reports whether each replica is currently used
+    def status(self):
+        now = monotonic()
+        return [{'replica': position, 'healthy': self.down_until[position] <= now} for position in range(len(self.engines))]
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+# Routes the read endpoints to the replicas configured in REPLICA_DATABASE_URIS (the primary serves everything without them)
+def init_replicas(app):
+    uris = app.config['REPLICA_DATABASE_URIS']
+    app.extensions['replicas'] = ReplicaRouter(uris, app.config['REPLICA_RETRY_SECONDS']) if uris else None
+    app.teardown_request(close_read_session)
+
+# Returns the session of the read endpoints for the current request: on a healthy replica,
+# or on the primary when there are no replicas or none of them is available
+def get_read_session():
+    router = current_app.extensions.get('replicas')
+    if router is None:
+        return db.session
+
+    if 'read_session' not in g:
+        connection = router.connect()
+        if connection is None:
+            print("[Server] No replica is available, reading from the primary.")
+        g.read_session = Session(bind=connection) if connection is not None else None
+    return g.read_session or db.session
+
+# Releases the replica connection of the request, if one was opened
+def close_read_session(exception=None):
+    session = g.pop('read_session', None)
+    if session is not None:
+        connection = session.bind
+        session.close()
+        connection.close()
@@ -1,30 +1,159 @@
 # app/routes.py
 
 import re
-from flask import Blueprint, jsonify, request
-from sqlalchemy import func
+import base64
+import heapq
+import json
+from collections import namedtuple
+from flask import Blueprint, Response, jsonify, request, current_app
+from sqlalchemy import func, and_, select
 from datetime import datetime, timedelta
-from app.models import Currency, Record
-from app import db
+from app.models import Currency, Record, DailyMetric, MarketMetric
+from app.cache import cache_key, get_cache
+from app.metrics import get_metrics, start_request, finish_request
+from app.data_version import sync_data_version
+from app.search_index import get_search_index
+from app.coverage import get_coverage_index
+from app.replicas import get_read_session
+from app.serialization import DASHBOARD_FIELDS, CANDLE_FIELDS, FORMATS, dumps, to_columnar, should_stream, iter_json
 
 bp = Blueprint('main', __name__)
 
 date_pattern = re.compile(r'\d{4}-\d{2}-\d{2}')
 
+# Measure every request of the blueprint (latency, SQL statements and database time)
+bp.before_request(start_request)
+bp.after_request(finish_request)
+
+# Drop the cached data of this worker when another process changed the data
+bp.before_request(sync_data_version)
+
 # Define a before_request function to check for 404 errors
 @bp.before_request
 def check_for_404():
     if request.endpoint is None:
         return jsonify({"error": "Bad request."}), 404
 
+# Dependencies of the endpoint logic, shared by the Flask views and the ASGI app (see app/asgi.py)
+Context = namedtuple('Context', ['connection', 'config', 'cache', 'search_index', 'coverage_index'])
+
+# Builds the context of a Flask request, whose queries go to a read replica when configured
+# (the ingestion and removals use db.session, always on the primary)
+def flask_context():
+    return Context(get_read_session(), current_app.config, get_cache(), get_search_index, get_coverage_index)
+
 # Route for getting crypto records
 @bp.route('/dashboard', methods=['GET'])
 def search_crypto_prices():
+    response_data, status = dashboard_response(request.args, flask_context())
+    return json_response(response_data, status)
+
+# Encodes a potentially large response with the fast encoder, streaming long lists
+def json_response(response_data, status):
+    if should_stream(response_data, current_app.config['JSON_STREAM_ROWS']):
+        return Response(iter_json(response_data), status=status, mimetype='application/json')
+    return Response(dumps(response_data), status=status, mimetype='application/json')
+
+# Route for the liveness probe, which does not touch the database
+@bp.route('/healthz', methods=['GET'])
+def liveness_probe():
+    response_data, status = liveness_response(request.args, None)
+    return jsonify(response_data), status
+
+# Route for the readiness probe, ready once the bootstrap is not running and the data is loaded
+@bp.route('/readyz', methods=['GET'])
+def readiness_probe():
+    bootstrap = current_app.extensions['bootstrap']
+    if bootstrap.running:
+        response_data, status = {"status": "loading"}, 503
+    else:
+        response_data, status = readiness_response(request.args, flask_context())
+    response_data['bootstrap'] = bootstrap.as_dict()
+    replicas = current_app.extensions['replicas']
+    if replicas is not None:
+        response_data['replicas'] = replicas.status()
+    return jsonify(response_data), status
+
+# Route for reading the cache counters
+@bp.route('/cache', methods=['GET'])
+def cache_stats():
+    return jsonify(get_cache().stats()), 200
+
+# Route for the Prometheus metrics of this process
+@bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(get_metrics().render(get_cache().stats()), mimetype='text/plain; version=0.0.4')
+
+# Route for listing the dates with records of crypto(s)
+@bp.route('/coverage', methods=['GET'])
+def search_crypto_coverage():
+    response_data, status = coverage_response(request.args, flask_context())
+    return jsonify(response_data), status
+
+# Route for getting the OHLCV series of crypto(s) over a date range
+@bp.route('/series', methods=['GET'])
+def search_crypto_series():
+    response_data, status = series_response(request.args, flask_context())
+    return json_response(response_data, status)
+
+# Route for the volatility, moving averages and return correlations of crypto(s) over a window
+@bp.route('/analytics', methods=['GET'])
+def search_crypto_analytics():
+    response_data, status = analytics_response(request.args, flask_context())
+    return json_response(response_data, status)
+
+# Route for the market-wide totals and dominance of each day over a date range
+@bp.route('/market', methods=['GET'])
+def search_market_overview():
+    response_data, status = market_response(request.args, flask_context())
+    return json_response(response_data, status)
+
+# Route for searching crypto existence in the database
+@bp.route('/search', methods=['GET'])
+def search_crypto_exists():
+    response_data, status = search_response(request.args, flask_context())
+    return jsonify(response_data), status
+
+# Route for completing a crypto name or symbol prefix
+@bp.route('/search/autocomplete', methods=['GET'])
+def autocomplete_crypto():
+    response_data, status = autocomplete_response(request.args, flask_context())
+    return jsonify(response_data), status
+
+# Route for searching the existence of many cryptos in one call
+@bp.route('/search/batch', methods=['GET'])
+def search_crypto_exists_batch():
+    response_data, status = search_batch_response(request.args, flask_context())
+    return jsonify(response_data), status
+
+# Reports that the process is alive
+def liveness_response(args, context):
+    return {"status": "ok"}, 200
+
+# Reports whether the currencies and records have been loaded
+def readiness_response(args, context):
+    try:
+        loaded = all(
+            context.connection.execute(select(column).limit(1)).first() is not None
+            for column in (Currency.id, Record.currency_id)
+        )
+    except Exception as e:
+        return {"status": "unavailable", "error": str(e)}, 503
+
+    if not loaded:
+        return {"status": "empty"}, 503
+    return {"status": "ready"}, 200
+
+# Reads the crypto records of the dashboard
+def dashboard_response(args, context):
     # Extract parameters from the request
-    crypto_id = request.args.get('id')
-    date = request.args.get('date')
-    order_by = request.args.get('order_by')
-    order_type = request.args.get('order_type')
+    crypto_id = args.get('id')
+    date = args.get('date')
+    order_by = args.get('order_by')
+    order_type = args.get('order_type')
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    response_format = args.get('format', 'rows')
 
     # Define valid values for order_by and order_type
     valid_order_by_values = ['crypto', 'symbol', 'price', '24h', '7d', '1m', '24h-volume', 'market-cap']
@@ -32,153 +161,543 @@ def search_crypto_prices():
 
     # Validate parameters
     if not all([crypto_id, date, order_by, order_type]):
-        return jsonify({"error": "Missing parameter(s)."}), 400
+        return {"error": "Missing parameter(s)."}, 400
     # Validate 'id' (crypto_id)
     if not isinstance(crypto_id, str):
-        return jsonify({"error": "Invalid data type for 'id'. 'id' must be a string."}), 400
+        return {"error": "Invalid data type for 'id'. 'id' must be a string."}, 400
     # Validate 'date' format
     if not date_pattern.match(date):
-        return jsonify({"error": "Invalid format for 'date'. Please use the format YYYY-MM-DD."}), 400
+        return {"error": "Invalid format for 'date'. Please use the format YYYY-MM-DD."}, 400
     # Validate 'order_by'
     if order_by not in valid_order_by_values:
-        return jsonify({"error": "Invalid value for 'order_by'."}), 400
+        return {"error": "Invalid value for 'order_by'."}, 400
     # Validate 'order_type'
     if order_type not in valid_order_type_values:
-        return jsonify({"error": "Invalid value for 'order_type'."}), 400
+        return {"error": "Invalid value for 'order_type'."}, 400
+    # Validate 'format'
+    if response_format not in FORMATS:
+        return {"error": "Invalid value for 'format'."}, 400
+    # Validate 'limit' and 'cursor'
+    if limit is not None and (not limit.isdigit() or int(limit) < 1):
+        return {"error": "Invalid value for 'limit'. 'limit' must be a positive integer."}, 400
+    if cursor is not None and limit is None:
+        return {"error": "Missing parameter 'limit'. 'cursor' requires 'limit'."}, 400
+    offset = decode_cursor(cursor) if cursor is not None else 0
+    if offset is None:
+        return {"error": "Invalid value for 'cursor'."}, 400
 
     # Read the crypto(s) for the dashboard
     crypto = read_crypto_id(crypto_id)
 
-    # Verify that there are records for the previous 30 days
-    if not verify_date(crypto, date):
-        return jsonify({"error": "Invalid value for 'date'. No records for the previous 30 days."}), 404
+    # Only the entries up to the end of the page are ordered, plus one to tell whether a next page exists
+    count = offset + int(limit) + 1 if limit is not None else None
 
-    processed_crypto = process_crypto(crypto, date)
-    ordered_crypto = order_crypto(processed_crypto, order_by, order_type)
+    # Serve identical queries from the cache, keyed on the normalized symbol set
+    key = cache_key('dashboard', sorted(symbol.lower() for symbol in crypto) if crypto is not None else 'all', date, order_by, order_type, count)
+    found, ordered_crypto = context.cache.get(key)
+    if not found:
+        ordered_crypto = build_dashboard(crypto, date, order_by, order_type, context, count)
+        context.cache.set(key, ordered_crypto)
 
-    return jsonify(ordered_crypto), 200
+    if ordered_crypto is None:
+        return {"error": "Invalid value for 'date'. No records for the previous 30 days."}, 404
 
-# Route for searching crypto existence in the database
-@bp.route('/search', methods=['GET'])
-def search_crypto_exists():
+    ordered_crypto = label_crypto(crypto, ordered_crypto)
+    if limit is None:
+        return format_rows(ordered_crypto, DASHBOARD_FIELDS, response_format), 200
+
+    # Return the requested page with the cursor of the next one, or null on the last page
+    end = offset + int(limit)
+    next_cursor = encode_cursor(end) if len(ordered_crypto) > end else None
+    return {"data": format_rows(ordered_crypto[offset:end], DASHBOARD_FIELDS, response_format), "next_cursor": next_cursor}, 200
+
+# Reads the OHLCV series of crypto(s) over a date range
+def series_response(args, context):
+    # Extract parameters from the request
+    crypto_id = args.get('id')
+    start = args.get('start')
+    end = args.get('end')
+    interval = args.get('interval', 'daily')
+    max_points = args.get('max_points')
+    response_format = args.get('format', 'rows')
+
+    # Validate parameters
+    if not all([crypto_id, start, end]):
+        return {"error": "Missing parameter(s)."}, 400
+    # Validate 'start' and 'end' format
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end, '%Y-%m-%d').date()
+    except ValueError:
+        return {"error": "Invalid format for 'start' or 'end'. Please use the format YYYY-MM-DD."}, 400
+    if start_date > end_date:
+        return {"error": "Invalid value for 'start'. 'start' must not be after 'end'."}, 400
+    # Validate 'interval'
+    if interval not in bucket_functions:
+        return {"error": "Invalid value for 'interval'."}, 400
+    # Validate 'max_points'
+    if max_points is not None and (not max_points.isdigit() or int(max_points) < 1):
+        return {"error": "Invalid value for 'max_points'. 'max_points' must be a positive integer."}, 400
+    # Validate 'format'
+    if response_format not in FORMATS:
+        return {"error": "Invalid value for 'format'."}, 400
+
+    # Read the crypto(s) and their currencies
+    crypto = read_crypto_id(crypto_id)
+    currencies = context.connection.execute(
+        filter_crypto(select(Currency.id, Currency.name, Currency.symbol), crypto).order_by(Currency.id)
+    ).all()
+    matched = match_crypto(crypto, currencies)
+    if any(currency is None for _, currency in matched):
+        return {"error": "Invalid value for 'id'. No currency found for some symbol(s)."}, 404
+
+    # Fetch the records of every currency in one ordered query and build the candles
+    series = load_series([currency.id for _, currency in matched], start_date, end_date + timedelta(days=1), context.connection)
+    response_data = []
+    for symbol, currency in matched:
+        candles = resample_series(series.get(currency.id, []), bucket_functions[interval])
+        if max_points is not None:
+            candles = downsample_candles(candles, int(max_points))
+        response_data.append({'crypto': currency.name, 'symbol': symbol, 'series': format_rows(candles, CANDLE_FIELDS, response_format)})
+
+    return response_data, 200
+
+# Computes the rolling volatility, SMA/EMA and return correlation matrix of crypto(s) over the days before a date
+def analytics_response(args, context):
+    # Imported here so only the analytics pay for NumPy
+    from app.analytics import close_matrix, analyze
+
+    # Extract parameters from the request
+    crypto_id = args.get('id')
+    date = args.get('date')
+    window = args.get('window', '30')
+    period = args.get('period', '7')
+
+    # Validate parameters
+    if not all([crypto_id, date]):
+        return {"error": "Missing parameter(s)."}, 400
+    # Validate 'date' format
+    try:
+        end_date = datetime.strptime(date, '%Y-%m-%d').date()
+    except ValueError:
+        return {"error": "Invalid format for 'date'. Please use the format YYYY-MM-DD."}, 400
+    # Validate 'window' and 'period'
+    max_window = context.config['ANALYTICS_MAX_WINDOW']
+    if not window.isdigit() or not 2 <= int(window) <= max_window:
+        return {"error": f"Invalid value for 'window'. 'window' must be an integer between 2 and {max_window}."}, 400
+    if not period.isdigit() or not 2 <= int(period) <= int(window):
+        return {"error": "Invalid value for 'period'. 'period' must be an integer between 2 and 'window'."}, 400
+    window, period = int(window), int(period)
+
+    # Read the crypto(s) and their currencies
+    crypto = read_crypto_id(crypto_id)
+    currencies = context.connection.execute(
+        filter_crypto(select(Currency.id, Currency.name, Currency.symbol), crypto).order_by(Currency.id)
+    ).all()
+    matched = match_crypto(crypto, currencies)
+    if any(currency is None for _, currency in matched):
+        return {"error": "Invalid value for 'id'. No currency found for some symbol(s)."}, 404
+
+    # Serve identical requests from the cache, keyed on the normalized symbol set
+    key = cache_key('analytics', sorted(symbol.lower() for symbol in crypto) if crypto is not None else 'all', date, window, period)
+    found, response_data = context.cache.get(key)
+    if found:
+        return response_data, 200
+
+    # Load the aligned close matrix of every currency in one query, then compute everything on it at once
+    start_date = end_date - timedelta(days=window)
+    currency_ids = [currency.id for _, currency in matched]
+    records = load_closes(currency_ids if crypto is not None else None, start_date, end_date, context.connection)
+    analytics = analyze(close_matrix(records, currency_ids, start_date, window), period)
+
+    response_data = {
+        'dates': [(start_date + timedelta(days=day)).isoformat() for day in range(window)],
+        'crypto': [{
+            'crypto': currency.name,
+            'symbol': symbol,
+            'sma': analytics['sma'][position],
+            'ema': analytics['ema'][position],
+            'volatility': analytics['volatility'][position]
+        } for position, (symbol, currency) in enumerate(matched)],
+        'correlation': analytics['correlation']
+    }
+    context.cache.set(key, response_data)
+    return response_data, 200
+
+# Reads the market rollup of the days in a date range
+def market_response(args, context):
+    # Extract parameters from the request
+    start = args.get('start')
+    end = args.get('end')
+
+    # Validate parameters
+    if not all([start, end]):
+        return {"error": "Missing parameter(s)."}, 400
+    # Validate 'start' and 'end' format
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end, '%Y-%m-%d').date()
+    except ValueError:
+        return {"error": "Invalid format for 'start' or 'end'. Please use the format YYYY-MM-DD."}, 400
+    if start_date > end_date:
+        return {"error": "Invalid value for 'start'. 'start' must not be after 'end'."}, 400
+
+    # One primary key range read of the rollup, with the name of each day's leader
+    days = context.connection.execute(select(
+        MarketMetric.date, MarketMetric.total_marketcap, MarketMetric.total_volume, MarketMetric.currencies,
+        MarketMetric.top_marketcap, MarketMetric.leader_marketcap, Currency.name, Currency.symbol
+    ).outerjoin(
+        Currency, Currency.id == MarketMetric.leader_id
+    ).where(
+        MarketMetric.date >= start_date,
+        MarketMetric.date <= end_date
+    ).order_by(MarketMetric.date)).all()
+
+    # Calculate a share of the total market cap, null when it is unknown or zero
+    def dominance(marketcap, total):
+        return marketcap / total * 100 if marketcap is not None and total else None
+
+    return [{
+        'date': day.date.isoformat(),
+        'market-cap': day.total_marketcap,
+        'volume': day.total_volume,
+        'currencies': day.currencies,
+        'top-dominance': dominance(day.top_marketcap, day.total_marketcap),
+        'leader': {'crypto': day.name, 'symbol': day.symbol, 'dominance': dominance(day.leader_marketcap, day.total_marketcap)} if day.name else None
+    } for day in days], 200
+
+# Lists the days with records and the valid dashboard dates of crypto(s)
+def coverage_response(args, context):
     # Extract parameter from the request
-    crypto_name = request.args.get('name')
+    crypto_id = args.get('id')
+
+    # Validate parameter
+    if not crypto_id:
+        return {"error": "Missing parameter(s)."}, 400
+
+    response_data = context.coverage_index().ranges(read_crypto_id(crypto_id))
+    if response_data is None:
+        return {"error": "Invalid value for 'id'. No currency found for some symbol(s)."}, 404
+    return response_data, 200
+
+# Searches a crypto by name or symbol
+def search_response(args, context):
+    # Extract parameter from the request
+    crypto_name = args.get('name')
 
     # Validate that crypto_name is a string
     if not isinstance(crypto_name, str):
-        return jsonify({"error": "Invalid data type for 'name'. 'name' must be a string."}), 400
-
-    # Find the Currency with the matching name (case-insensitive)
-    currency = Currency.query.filter(func.lower(Currency.name) == func.lower(crypto_name)).first()
+        return {"error": "Invalid data type for 'name'. 'name' must be a string."}, 400
 
-    # If not found by name, try finding by symbol (case-insensitive)
-    if not currency:
-        currency = Currency.query.filter(func.lower(Currency.symbol) == func.lower(crypto_name)).first()
+    # Serve repeated lookups from the cache
+    key = cache_key('search', crypto_name.lower())
+    found, response_data = context.cache.get(key)
+    if not found:
+        response_data = context.search_index().find(crypto_name)
+        context.cache.set(key, response_data)
 
     # Check if a currency is found
-    if currency:
-        response_data = {"name": currency.name, "symbol": currency.symbol}
-        return jsonify(response_data), 200
+    if response_data:
+        return response_data, 200
     else:
-        return jsonify({"error": f"No currency found with name or symbol '{crypto_name}'."}), 404
+        return {"error": f"No currency found with name or symbol '{crypto_name}'."}, 404
+
+# Completes a crypto name or symbol prefix
+def autocomplete_response(args, context):
+    # Extract parameters from the request
+    prefix = args.get('prefix')
+    limit = args.get('limit', '10')
 
-# Extracts the list of crypto symbols based on the provided crypto_id
+    # Validate parameters
+    if not prefix:
+        return {"error": "Missing parameter(s)."}, 400
+    if not limit.isdigit() or int(limit) < 1:
+        return {"error": "Invalid value for 'limit'. 'limit' must be a positive integer."}, 400
+
+    return context.search_index().complete(prefix, int(limit)), 200
+
+# Searches many cryptos by name or symbol
+def search_batch_response(args, context):
+    # Extract parameter from the request
+    crypto_names = args.get('names')
+
+    # Validate parameter
+    if not crypto_names:
+        return {"error": "Missing parameter(s)."}, 400
+
+    # Map each name to its currency, or null if it does not exist
+    index = context.search_index()
+    return {crypto_name: index.find(crypto_name) for crypto_name in crypto_names.split(',')}, 200
+
+# Extracts the list of crypto symbols based on the provided crypto_id (None means all currencies)
 def read_crypto_id(crypto_id):
-    crypto_list = []
     if crypto_id == 'all':
-        all_currencies = Currency.query.all()
-        crypto_list = [currency.symbol for currency in all_currencies]
-    else:
-        crypto_ids = crypto_id.split(',')
-        crypto_list.extend(crypto_ids)
-    return crypto_list
+        # All currencies are resolved by the dashboard query itself
+        return None
+
+    # Keep the first spelling of each symbol, as symbols are case-insensitive
+    crypto = {}
+    for symbol in crypto_id.split(','):
+        crypto.setdefault(symbol.lower(), symbol)
+    return list(crypto.values())
+
+# Returns the rows as they are, or as one array per field for the columnar format
+def format_rows(rows, fields, response_format):
+    if response_format == 'columnar':
+        return to_columnar(rows, fields)
+    return rows
+
+# Encodes the offset of the next dashboard page as an opaque cursor
+def encode_cursor(offset):
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode()).decode()
+
+# Decodes a dashboard cursor into its offset, or None if the cursor is invalid
+def decode_cursor(cursor):
+    try:
+        offset = json.loads(base64.urlsafe_b64decode(cursor.encode()))['offset']
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        return None
+    return offset
+
+# Computes the ordered dashboard entries (only the first count if given), or None if any crypto lacks a full 30-day window
+def build_dashboard(crypto, date, order_by, order_type, context, count=None):
+    # Compute and order the dashboard from the in-memory store if enabled
+    if context.config['DASHBOARD_STORE'] == 'memory':
+        from app.store import store
+        return store.dashboard(crypto, date, order_by, order_type, count)
+
+    # Verify that there are records for the previous 30 days before reading any of them
+    if not verify_date(crypto, date, context.coverage_index()):
+        return None
+
+    # Fetch the 30-day window of every requested crypto at once
+    dashboard = load_dashboard(crypto, date, context.connection)
+
+    # The rows may still lack days of the index (e.g. on a replica behind the primary), which is a miss
+    # rather than a dashboard without those cryptos
+    if not has_full_window(crypto, dashboard):
+        return None
+
+    processed_crypto = process_crypto(crypto, dashboard)
+    return order_crypto(processed_crypto, order_by, order_type, count)
+
+# Labels the entries with the symbols as spelled in the request (cached entries may use another spelling)
+def label_crypto(crypto, ordered_crypto):
+    if crypto is None:
+        return ordered_crypto
+
+    labels = {symbol.lower(): symbol for symbol in crypto}
+    return [dict(entry, symbol=labels[entry['symbol'].lower()]) for entry in ordered_crypto]
+
+# Builds the set-based dashboard query for the days in [start_date, end_date)
+def dashboard_query(crypto, start_date, end_date):
+    # Rank every record in the window per currency, ordered by date
+    window = {'partition_by': Record.currency_id, 'order_by': Record.date}
+    ranked = select(
+        Record.currency_id.label('currency_id'),
+        Record.close.label('close'),
+        Record.volume.label('volume'),
+        Record.marketcap.label('marketcap'),
+        func.lag(Record.close, 1).over(**window).label('close_24h'),
+        func.lag(Record.close, 7).over(**window).label('close_7d'),
+        func.first_value(Record.close).over(**window).label('close_1m'),
+        func.count().over(partition_by=Record.currency_id).label('records'),
+        func.row_number().over(partition_by=Record.currency_id, order_by=Record.date.desc()).label('position')
+    ).where(
+        # Plain bounds on the leading key columns after the currency, so PostgreSQL only scans the
+        # partitions of the window and reads each currency's days in primary key order
+        Record.date >= start_date,
+        Record.date < end_date
+    ).subquery()
+
+    # Calculate a percentage change against a previous close, NULL when it is zero
+    def change(previous):
+        return (ranked.c.close - previous) / func.nullif(previous, 0) * 100
+
+    # Join the latest record of each currency, keeping currencies without any record in the window
+    query = select(
+        Currency.id.label('currency_id'),
+        Currency.name.label('name'),
+        Currency.symbol.label('symbol'),
+        ranked.c.close.label('price'),
+        change(ranked.c.close_24h).label('change_24h'),
+        change(ranked.c.close_7d).label('change_7d'),
+        change(ranked.c.close_1m).label('change_1m'),
+        ranked.c.volume.label('volume'),
+        ranked.c.marketcap.label('marketcap'),
+        (ranked.c.records >= 30).label('full_window')
+    ).outerjoin(
+        ranked, and_(ranked.c.currency_id == Currency.id, ranked.c.position == 1)
+    )
+
+    return filter_crypto(query, crypto).order_by(Currency.id)
+
+# Builds the query reading the precomputed dashboard snapshot of a single day
+def snapshot_query(crypto, day):
+    query = select(
+        Currency.id.label('currency_id'),
+        Currency.name.label('name'),
+        Currency.symbol.label('symbol'),
+        DailyMetric.close.label('price'),
+        DailyMetric.change_24h.label('change_24h'),
+        DailyMetric.change_7d.label('change_7d'),
+        DailyMetric.change_1m.label('change_1m'),
+        DailyMetric.volume.label('volume'),
+        DailyMetric.marketcap.label('marketcap'),
+        DailyMetric.full_window.label('full_window')
+    ).outerjoin(
+        DailyMetric, and_(DailyMetric.currency_id == Currency.id, DailyMetric.date == day)
+    )
+
+    return filter_crypto(query, crypto).order_by(Currency.id)
+
+# Restricts a currency query to the specified symbols (case-insensitive)
+def filter_crypto(query, crypto):
+    if crypto is None:
+        return query
+    return query.filter(func.lower(Currency.symbol).in_({symbol.lower() for symbol in crypto}))
+
+# Loads the dashboard rows of the specified symbols and date, from the snapshot when it covers the date
+def load_dashboard(crypto, date, connection):
+    try:
+        end_date = datetime.strptime(date, '%Y-%m-%d').date()
+    except ValueError:
+        # Handle invalid date format
+        return None
+
+    dashboard = connection.execute(snapshot_query(crypto, end_date)).all()
+    if any(row.full_window is not None for row in dashboard):
+        return dashboard
+
+    # Compute the window live if the snapshot has not been built for this date
+    start_date = end_date - timedelta(days=30)
+    return connection.execute(dashboard_query(crypto, start_date, end_date)).all()
+
+# Pairs each requested symbol with its dashboard row (None if the currency does not exist)
+def match_crypto(crypto, dashboard):
+    if crypto is None:
+        return [(row.symbol, row) for row in dashboard]
+
+    rows_by_symbol = {}
+    for row in dashboard:
+        rows_by_symbol.setdefault(row.symbol.lower(), row)
+    return [(symbol, rows_by_symbol.get(symbol.lower())) for symbol in crypto]
 
-# Verifies if there are records for the previous 30 days based on the provided date
-def verify_date(crypto, date):
+# Verifies from the coverage index if there are records for the previous 30 days for every requested crypto
+def verify_date(crypto, date, coverage_index):
     try:
-        input_date = datetime.strptime(date, '%Y-%m-%d')
-        start_date = input_date - timedelta(days=30)
-
-        for symbol in crypto:
-            currency_info = Currency.query.filter(func.lower(Currency.symbol) == func.lower(symbol)).first()
-
-            if currency_info:
-                records_in_range = Record.query.filter(
-                    Record.currency_id == currency_info.id,
-                    Record.date >= start_date,
-                    Record.date <= input_date
-                ).all()
-
-                # If any crypto has fewer than 30 records, return False
-                if len(records_in_range) < 30:
-                    return False
-            else:
-                # If the currency symbol is not found, consider it a failure
-                return False
-
-        # If all cryptos have 30 or more records, return True
-        return True
-    
+        end_date = datetime.strptime(date, '%Y-%m-%d').date()
     except ValueError:
         # Handle invalid date format
         return False
 
-# Processes crypto data for the specified symbols and date
-def process_crypto(crypto, date):
+    # If the currency symbol is not found or misses a day of the window, consider it a failure
+    return coverage_index.has_window(crypto, end_date)
+
+# Verifies from the dashboard rows if there are records for the previous 30 days for every requested crypto
+def has_full_window(crypto, dashboard):
+    if dashboard is None:
+        return False
+
+    # If the currency symbol is not found or has fewer than 30 records, consider it a failure
+    return all(row is not None and row.full_window for _, row in match_crypto(crypto, dashboard))
+
+# Processes the dashboard rows into the response entries
+def process_crypto(crypto, dashboard):
     crypto_data = []
 
-    for symbol in crypto:
-        try:
-            currency = Currency.query.filter(func.lower(Currency.symbol).ilike(func.lower(symbol))).first()
-
-            if currency:
-                # Find the associated records for the previous 30 days
-                end_date = datetime.strptime(date, '%Y-%m-%d')
-                start_date = end_date - timedelta(days=30)
-                previous_records = Record.query.filter(
-                    Record.currency_id == currency.id,
-                    Record.date >= start_date,
-                    Record.date <= end_date
-                ).all()
-
-                if len(previous_records) >= 30:
-                    # Calculate the required values
-                    latest_record = previous_records[-1]
-                    price = latest_record.close
-                    volume = latest_record.volume
-                    market_cap = latest_record.marketcap
-
-                    # Calculate percentage changes
-                    price_change_24h = ((latest_record.close - previous_records[-2].close) / previous_records[-2].close) * 100
-                    price_change_7d = ((latest_record.close - previous_records[-8].close) / previous_records[-8].close) * 100
-                    price_change_1m = ((latest_record.close - previous_records[0].close) / previous_records[0].close) * 100
-
-                    # Create a dictionary for the current cryptocurrency
-                    crypto_entry = {
-                        'crypto': currency.name,
-                        'symbol': symbol,
-                        'price': price,
-                        '24h': price_change_24h,
-                        '7d': price_change_7d,
-                        '1m': price_change_1m,
-                        '24h-volume': volume,
-                        'market-cap': market_cap
-                    }
-
-                    # Append the dictionary to the array
-                    crypto_data.append(crypto_entry)
-            #     else:
-            #         print(f"[Server] Not enough records for Symbol: {symbol}")
-            # else:
-            #     print(f"[Server] No currency found for Symbol: {symbol}")
-        except Exception as e:
-            # Handle any other exceptions that might occur during the process
-            print(f"[Server] An error occurred for Symbol: {symbol}. Error: {str(e)}")
+    for symbol, row in match_crypto(crypto, dashboard):
+        if row is None or not row.full_window:
+            continue
+
+        # A zero previous close makes the percentage change undefined
+        if None in (row.change_24h, row.change_7d, row.change_1m):
+            print(f"[Server] An error occurred for Symbol: {symbol}. Error: previous close is zero")
+            continue
+
+        # Create a dictionary for the current cryptocurrency
+        crypto_data.append({
+            'crypto': row.name,
+            'symbol': symbol,
+            'price': row.price,
+            '24h': row.change_24h,
+            '7d': row.change_7d,
+            '1m': row.change_1m,
+            '24h-volume': row.volume,
+            'market-cap': row.marketcap
+        })
 
     return crypto_data
 
-# Orders the processed_crypto data based on specified criteria
-def order_crypto(processed_crypto, order_by, order_type):
+# Map each series interval to the function returning the first day of a record's candle
+bucket_functions = {
+    'daily': lambda date: date,
+    'weekly': lambda date: date - timedelta(days=date.weekday()),
+    'monthly': lambda date: date.replace(day=1)
+}
+
+# Loads the records of the currencies in [start_date, end_date), grouped by currency and ordered by date
+def load_series(currency_ids, start_date, end_date, connection):
+    records = connection.execute(select(
+        Record.currency_id, Record.date, Record.open, Record.high, Record.low, Record.close, Record.volume
+    ).where(
+        Record.currency_id.in_(currency_ids),
+        Record.date >= start_date,
+        Record.date < end_date
+    ).order_by(Record.currency_id, Record.date)).all()
+
+    series = {}
+    for record in records:
+        series.setdefault(record.currency_id, []).append(record)
+    return series
+
+# Loads the closes of the currencies (every currency for None) in [start_date, end_date)
+def load_closes(currency_ids, start_date, end_date, connection):
+    query = select(Record.currency_id, Record.date, Record.close).where(
+        Record.date >= start_date,
+        Record.date < end_date
+    )
+    if currency_ids is not None:
+        query = query.where(Record.currency_id.in_(currency_ids))
+    return connection.execute(query).all()
+
+# Merges consecutive records or candles into one candle (open=first, high=max, low=min, close=last, volume=sum)
+def merge_candle(date, items):
+    return {
+        'date': date,
+        'open': items[0]['open'],
+        'high': max((item['high'] for item in items if item['high'] is not None), default=None),
+        'low': min((item['low'] for item in items if item['low'] is not None), default=None),
+        'close': items[-1]['close'],
+        'volume': sum(item['volume'] for item in items if item['volume'] is not None)
+    }
+
+# Resamples the ordered records into candles starting at the day given by bucket
+def resample_series(records, bucket):
+    candles = []
+    current_day, items = None, []
+    for record in records:
+        day = bucket(record.date)
+        if items and day != current_day:
+            candles.append(merge_candle(current_day.isoformat(), items))
+            items = []
+        current_day = day
+        items.append(record._asdict())
+    if items:
+        candles.append(merge_candle(current_day.isoformat(), items))
+    return candles
+
+# Merges consecutive candles so that at most max_points remain
+def downsample_candles(candles, max_points):
+    if len(candles) <= max_points:
+        return candles
+    size = -(-len(candles) // max_points)
+    return [merge_candle(candles[i]['date'], candles[i:i + size]) for i in range(0, len(candles), size)]
+
+# Orders the processed_crypto data based on specified criteria, keeping only the first limit entries if given
+def order_crypto(processed_crypto, order_by, order_type, limit=None):
     # Define a mapping of order_by values to corresponding fields in the processed_crypto data
     order_by_mapping = {
         'symbol': 'symbol',
@@ -197,7 +716,16 @@ def order_crypto(processed_crypto, order_by, order_type):
     # Determine the reverse flag based on order_type
     reverse_flag = order_type.lower() == 'desc'
 
+    # Entries without the value (e.g. a blank market cap in the CSV) come last in either order
+    present = [entry for entry in processed_crypto if key_function(entry) is not None]
+    missing = [entry for entry in processed_crypto if key_function(entry) is None]
+
+    # Select the leading entries with a heap when limited, which matches the full sort truncated to the limit
+    if limit is not None:
+        select_leading = heapq.nlargest if reverse_flag else heapq.nsmallest
+        return (select_leading(limit, present, key=key_function) + missing)[:limit]
+
     # Sort the processed_crypto data based on the specified criteria
-    ordered_crypto = sorted(processed_crypto, key=key_function, reverse=reverse_flag)
+    ordered_crypto = sorted(present, key=key_function, reverse=reverse_flag) + missing
 
     return ordered_crypto
\ No newline at end of file
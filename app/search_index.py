@@ -0,0 +1,64 @@
+# app/search_index.py
+
+import heapq
+from bisect import bisect_left
+from flask import current_app
+from sqlalchemy import select
+from app.models import db, Currency
+
+class SearchIndex:
+    # Indexes the currencies given in id order, so the first currency wins on duplicate names or symbols
+    def __init__(self, currencies):
+        self.entries = []
+        self.by_name = {}
+        self.by_symbol = {}
+        terms = []
+
+        for position, (name, symbol) in enumerate(currencies):
+            self.entries.append({"name": name, "symbol": symbol})
+            for term, lookup in ((name, self.by_name), (symbol, self.by_symbol)):
+                if term:
+                    lookup.setdefault(term.lower(), position)
+                    terms.append((term.lower(), position))
+
+        # Sorted (term, position) pairs, where the terms sharing a prefix are contiguous
+        self.terms = sorted(terms)
+
+    # Reads every currency from the database
+    @classmethod
+    def load(cls, connection=None):
+        return cls((connection or db.session).execute(select(Currency.name, Currency.symbol).order_by(Currency.id)).all())
+
+    # Finds a currency by name, then by symbol (case-insensitive)
+    def find(self, crypto_name):
+        term = crypto_name.lower()
+        position = self.by_name.get(term)
+        if position is None:
+            position = self.by_symbol.get(term)
+        return self.entries[position] if position is not None else None
+
+    # Returns up to limit currencies whose name or symbol starts with the prefix, shortest match first
+    def complete(self, prefix, limit):
+        prefix = prefix.lower()
+        best = {}
+        for term, position in self.terms[bisect_left(self.terms, (prefix,)):]:
+            if not term.startswith(prefix):
+                break
+            rank = (len(term), term, position)
+            if position not in best or rank < best[position]:
+                best[position] = rank
+
+        return [self.entries[rank[2]] for rank in heapq.nsmallest(limit, best.values())]
+
+# Returns the search index of the current app, building it on first use
+def get_search_index():
+    index = current_app.extensions.get('search_index')
+    if index is None:
+        index = rebuild_search_index()
+    return index
+
+# Rebuilds the search index from the database (after the currencies changed)
+def rebuild_search_index():
+    index = SearchIndex.load()
+    current_app.extensions['search_index'] = index
+    return index
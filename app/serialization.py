@@ -0,0 +1,44 @@
+# app/serialization.py
+
+import json
+
+# Rows encoded per streamed chunk
+CHUNK_ROWS = 256
+
+# Fields of the dashboard entries and series candles, in column order
+DASHBOARD_FIELDS = ['crypto', 'symbol', 'price', '24h', '7d', '1m', '24h-volume', 'market-cap']
+CANDLE_FIELDS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# Response formats, 'columnar' giving one array per field instead of one object per row
+FORMATS = ['rows', 'columnar']
+
+_orjson = None
+
+# Encodes data as compact JSON with sorted keys, with orjson if it is installed
+def dumps(data):
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson
+            _orjson = orjson
+        except ImportError:
+            _orjson = False
+    if _orjson:
+        return _orjson.dumps(data, option=_orjson.OPT_SORT_KEYS | _orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+
+# Converts a list of rows into a header and one array per field
+def to_columnar(rows, fields):
+    return {'fields': fields, 'columns': [[row[field] for row in rows] for field in fields]}
+
+# Whether the data is a list long enough to be streamed rather than encoded at once
+def should_stream(data, stream_rows):
+    return isinstance(data, list) and 0 < stream_rows <= len(data)
+
+# Encodes a list of rows as JSON chunks, so the whole encoded response is never held in memory
+def iter_json(rows):
+    yield b'['
+    for start in range(0, len(rows), CHUNK_ROWS):
+        chunk = b','.join(dumps(row) for row in rows[start:start + CHUNK_ROWS])
+        yield chunk if start == 0 else b',' + chunk
+    yield b']'
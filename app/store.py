@@ -0,0 +1,244 @@
+# app/store.py
+
+import os
+import json
+import numpy as np
+from datetime import datetime
+from sqlalchemy import select
+from app.models import db, Currency, Record
+
+# Each currency owns a disjoint range of the (currency, day) search key, days counted from the epoch
+SEGMENT = 1 << 40
+
+# Fields of the dashboard entries, in the order they are emitted
+FIELDS = ['crypto', 'symbol', 'price', '24h', '7d', '1m', '24h-volume', 'market-cap']
+
+# Fields read from the nullable record columns
+NULLABLE_FIELDS = ['24h-volume', 'market-cap']
+
+# Columns of the snapshot file, all 8-byte aligned so they can be memory-mapped in place
+SNAPSHOT_MAGIC = b'KRSNAP02'
+SNAPSHOT_COLUMNS = {'offsets': np.int64, 'keys': np.int64, 'close': np.float64, 'volume': np.float64, 'marketcap': np.float64}
+
+class TimeSeriesStore:
+    def __init__(self):
+        self.loaded = False
+        self.snapshot_path = None
+        self.snapshot_stamp = None
+
+    # Loads the store at start-up when the app serves the dashboard from memory
+    def init_app(self, app):
+        app.extensions['store'] = self
+        if app.config['DASHBOARD_STORE'] == 'memory':
+            snapshot_path = app.config['DASHBOARD_SNAPSHOT']
+            if snapshot_path and os.path.exists(snapshot_path) and is_snapshot(snapshot_path):
+                # Map the snapshot shared by every worker instead of querying the database
+                self.load_snapshot(snapshot_path)
+            else:
+                # Build the store, replacing a snapshot written by an older layout
+                with app.app_context():
+                    self.load()
+                if snapshot_path:
+                    write_snapshot(self, snapshot_path)
+                    self.load_snapshot(snapshot_path)
+
+    # Reads every currency and record into per-column NumPy arrays sorted by (currency, date)
+    def load(self, connection=None):
+        connection = connection or db.session
+        currencies = connection.execute(select(Currency.id, Currency.name, Currency.symbol).order_by(Currency.id)).all()
+        records = connection.execute(
+            select(Record.currency_id, Record.date, Record.close, Record.volume, Record.marketcap)
+            .order_by(Record.currency_id, Record.date)
+        ).all()
+
+        position_by_id = {currency.id: position for position, currency in enumerate(currencies)}
+        positions = np.array([position_by_id[record.currency_id] for record in records], dtype=np.int64)
+        dates = np.array([record.date for record in records], dtype='datetime64[D]').astype(np.int64)
+        self.set_columns(
+            [(currency.name, currency.symbol) for currency in currencies],
+            offsets=np.searchsorted(positions, np.arange(len(currencies) + 1)).astype(np.int64),
+            keys=positions * SEGMENT + dates,
+            close=np.array([record.close for record in records], dtype=np.float64),
+            volume=np.array([record.volume for record in records], dtype=np.float64),
+            marketcap=np.array([record.marketcap for record in records], dtype=np.float64)
+        )
+
+        print(f"[Server] In-memory store loaded {len(records)} records of {len(currencies)} currencies.")
+
+    # Sets the currencies, as (name, symbol) pairs in id order, and the record columns
+    def set_columns(self, currencies, **columns):
+        self.currencies = currencies
+        self.names = np.array([name for name, _ in currencies], dtype=object)
+        self.symbols = np.array([symbol for _, symbol in currencies], dtype=object)
+        self.position_by_symbol = {}
+        for position, (_, symbol) in enumerate(currencies):
+            self.position_by_symbol.setdefault((symbol or '').lower(), position)
+
+        # offsets[i]:offsets[i + 1] is the range of the records of currency i
+        for name in SNAPSHOT_COLUMNS:
+            setattr(self, name, columns[name])
+        self.loaded = True
+
+    # Memory-maps a snapshot file, sharing its pages with every process mapping it
+    def load_snapshot(self, path):
+        stamp = file_stamp(path)
+        currencies, columns = read_snapshot(path)
+        self.set_columns(currencies, **columns)
+        self.snapshot_path = path
+        self.snapshot_stamp = stamp
+
+    # Remaps the snapshot if it has been swapped since it was mapped
+    def refresh(self):
+        if self.snapshot_path and file_stamp(self.snapshot_path) != self.snapshot_stamp:
+            self.load_snapshot(self.snapshot_path)
+
+    # Reloads the store from its source after the data changed
+    def reload(self, connection=None):
+        if self.snapshot_path:
+            self.load_snapshot(self.snapshot_path)
+        else:
+            self.load(connection)
+
+    # Computes the ordered dashboard entries, or None if any crypto lacks a full 30-day window
+    def dashboard(self, crypto, date, order_by, order_type, limit=None):
+        try:
+            end_date = datetime.strptime(date, '%Y-%m-%d').date()
+        except ValueError:
+            # Handle invalid date format
+            return None
+
+        # Pick up a snapshot regenerated by an ingest in another process
+        self.refresh()
+
+        # Resolve the requested symbols to currency positions
+        if crypto is None:
+            positions = np.arange(len(self.symbols), dtype=np.int64)
+            labels = self.symbols
+        else:
+            found = [self.position_by_symbol.get(symbol.lower()) for symbol in crypto]
+            if None in found:
+                return None
+            positions = np.array(found, dtype=np.int64)
+            labels = np.array(crypto, dtype=object)
+
+        # Locate the 30 days before the date for every currency with one binary search per bound
+        end = np.datetime64(end_date, 'D').astype(np.int64)
+        start = end - 30
+        lower = np.searchsorted(self.keys, positions * SEGMENT + start, side='left')
+        upper = np.searchsorted(self.keys, positions * SEGMENT + end, side='left')
+        if np.any(upper - lower < 30):
+            return None
+
+        latest = upper - 1
+        price = self.close[latest]
+        previous = {'24h': self.close[latest - 1], '7d': self.close[latest - 7], '1m': self.close[lower]}
+
+        # A zero previous close makes the percentage change undefined, so the crypto is skipped
+        valid = np.all([close != 0 for close in previous.values()], axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            changes = {field: (price - close) / close * 100 for field, close in previous.items()}
+
+        columns = {
+            'crypto': self.names[positions],
+            'symbol': labels,
+            'price': price,
+            '24h': changes['24h'],
+            '7d': changes['7d'],
+            '1m': changes['1m'],
+            '24h-volume': self.volume[latest],
+            'market-cap': self.marketcap[latest]
+        }
+        columns = {field: column[valid] for field, column in columns.items()}
+
+        order = order_columns(columns[order_by], order_type, limit)
+        values = {field: columns[field][order].tolist() for field in FIELDS}
+
+        # A blank volume or market cap is emitted as null, as from the database
+        for field in NULLABLE_FIELDS:
+            values[field] = [None if value != value else value for value in values[field]]
+        return [dict(zip(FIELDS, row)) for row in zip(*(values[field] for field in FIELDS))]
+
+# Returns the stable argsort of a column, keeping ties in their original order when descending
+# With a limit only the leading positions are returned, partially sorting numeric columns
+# Missing values (NaN) come last in either order
+def order_columns(column, order_type, limit=None):
+    if column.dtype != object:
+        missing = np.isnan(column)
+        if missing.any():
+            present = np.flatnonzero(~missing)
+            order = present[order_columns(column[present], order_type, limit)]
+            return np.concatenate([order, np.flatnonzero(missing)])[:limit]
+
+    descending = order_type.lower() == 'desc'
+    if limit is None or limit >= len(column) or column.dtype == object:
+        if descending:
+            order = len(column) - 1 - np.argsort(column[::-1], kind='stable')[::-1]
+        else:
+            order = np.argsort(column, kind='stable')
+        return order[:limit]
+
+    # Keep every value tied with the last one within the limit, then sort those by value and position
+    values = -column if descending else column
+    threshold = np.partition(values, limit - 1)[limit - 1]
+    candidates = np.flatnonzero(values <= threshold)
+    return candidates[np.lexsort((candidates, values[candidates]))][:limit]
+
+# Identifies the file currently at a path, which changes when a new snapshot is swapped in
+def file_stamp(path):
+    status = os.stat(path)
+    return status.st_ino, status.st_mtime_ns, status.st_size
+
+# Writes the store into a columnar snapshot file, swapped in atomically so readers never see a partial file
+def write_snapshot(source, path):
+    header = {'currencies': source.currencies, 'columns': {}}
+    offset = 0
+    for name, dtype in SNAPSHOT_COLUMNS.items():
+        column = np.ascontiguousarray(getattr(source, name), dtype=dtype)
+        header['columns'][name] = {'offset': offset, 'length': len(column)}
+        offset += column.nbytes
+
+    # Layout: magic, header size, JSON header padded to 8 bytes, then the columns back to back
+    header_bytes = json.dumps(header).encode()
+    header_bytes += b' ' * (-len(header_bytes) % 8)
+
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(np.int64(len(header_bytes)).tobytes())
+        file.write(header_bytes)
+        for name, dtype in SNAPSHOT_COLUMNS.items():
+            file.write(np.ascontiguousarray(getattr(source, name), dtype=dtype).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+# Whether a file is a snapshot of the current layout
+def is_snapshot(path):
+    with open(path, 'rb') as file:
+        return file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+# Memory-maps a snapshot file, returning its currencies and zero-copy column views
+def read_snapshot(path):
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(mapped[:8]) != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a dashboard snapshot.")
+
+    header_size = int(mapped[8:16].view(np.int64)[0])
+    header = json.loads(bytes(mapped[16:16 + header_size]))
+    data_start = 16 + header_size
+
+    columns = {}
+    for name, dtype in SNAPSHOT_COLUMNS.items():
+        start = data_start + header['columns'][name]['offset']
+        end = start + header['columns'][name]['length'] * np.dtype(dtype).itemsize
+        columns[name] = mapped[start:end].view(dtype)
+
+    return [tuple(currency) for currency in header['currencies']], columns
+
+# Exports the database into a snapshot file
+def export_snapshot(path, connection=None):
+    source = TimeSeriesStore()
+    source.load(connection)
+    write_snapshot(source, path)
+
+store = TimeSeriesStore()
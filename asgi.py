@@ -0,0 +1,6 @@
+# asgi.py
+
+from app.asgi import AsyncApp
+from config.settings import Config
+
+app = AsyncApp(Config) # uvicorn asgi:app --port=8000
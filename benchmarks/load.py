@@ -0,0 +1,63 @@
+# benchmarks/load.py
+
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from statistics import mean
+from time import perf_counter
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+# Returns the value at a fraction of the sorted values (nearest rank)
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    rank = min(max(math.ceil(fraction * len(sorted_values)), 1), len(sorted_values))
+    return sorted_values[rank - 1]
+
+# Requests a URL, returning its latency in seconds and its status (None on connection errors)
+def fetch(url, timeout):
+    start = perf_counter()
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        status = error.code
+    except (URLError, OSError):
+        status = None
+    return perf_counter() - start, status
+
+# Sends requests over the paths in turn from concurrent threads, returning the throughput and latency percentiles
+def run_load(base_url, paths, requests, concurrency, timeout=30):
+    urls = [base_url.rstrip('/') + path for path in islice(cycle(paths), requests)]
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda url: fetch(url, timeout), urls))
+    elapsed = perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'throughput': requests / elapsed if elapsed else None,
+        'errors': sum(1 for _, status in results if status is None or status >= 500),
+        'mean': mean(latencies) if latencies else None,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99)
+    }
+
+# Request handler without the access log, which would dominate the load test output
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, code='-', size='-'):
+        pass
+
+# Serves a WSGI app on a free local port from a background thread, returning the server (stop it with shutdown)
+def serve(app):
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
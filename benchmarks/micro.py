@@ -0,0 +1,38 @@
+# benchmarks/micro.py
+
+import statistics
+from time import perf_counter
+from app.models import Record
+from app.routes import process_crypto, order_crypto
+from utilities.helper import read_files_and_upload
+
+# Times fn over repeat rounds of number calls, returning the best and median seconds per call
+def measure(fn, repeat=5, number=1):
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((perf_counter() - start) / number)
+    return {'best': min(timings), 'median': statistics.median(timings), 'repeat': repeat, 'number': number}
+
+# Times processing the dashboard rows of every currency
+def bench_process_crypto(rows, repeat=5):
+    return measure(lambda: process_crypto(None, rows), repeat, number=10)
+
+# Times ordering the processed entries fully and keeping the top 20
+def bench_order_crypto(rows, repeat=5):
+    processed = process_crypto(None, rows)
+    return {
+        'full': measure(lambda: order_crypto(processed, 'market-cap', 'desc'), repeat, number=10),
+        'top_20': measure(lambda: order_crypto(processed, 'market-cap', 'desc', 20), repeat, number=10)
+    }
+
+# Times ingesting a folder of CSV files into the app's database, returning the rows per second
+def bench_ingest(app, folder):
+    start = perf_counter()
+    read_files_and_upload(app, str(folder))
+    elapsed = perf_counter() - start
+    with app.app_context():
+        rows = Record.query.count()
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_second': rows / elapsed}
@@ -0,0 +1,30 @@
+# benchmarks/queries.py
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+# Collects the SQL statements executed on an engine while the block runs
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+# Returns the number of SQL statements each path issues through the test client, once the
+# per-process state (data version, indexes) has been loaded by a first request
+def queries_per_request(app, engine, paths):
+    counts = {}
+    with app.test_client() as client:
+        client.get(paths[0])
+        for path in paths:
+            with count_queries(engine) as statements:
+                client.get(path)
+            counts[path] = len(statements)
+    return counts
@@ -0,0 +1,102 @@
+# benchmarks/run.py
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from config.settings import TestConfig
+from app import create_app, db
+from benchmarks.synthetic import START_DATE, write_csv_files, generate_dashboard_rows
+from benchmarks.micro import bench_process_crypto, bench_order_crypto, bench_ingest
+from benchmarks.queries import queries_per_request
+from benchmarks.load import run_load, serve
+
+# Returns the config of a benchmark app on a SQLite file
+def benchmark_config(database_path, cache_backend):
+    class BenchmarkConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{database_path}'
+        CACHE_BACKEND = cache_backend
+    return BenchmarkConfig
+
+# Returns the request paths exercised by the query count and the load test
+def request_paths(date):
+    return [
+        f'/dashboard?id=all&date={date}&order_by=market-cap&order_type=desc',
+        f'/dashboard?id=all&date={date}&order_by=price&order_type=asc&limit=20',
+        f'/dashboard?id=c00000,c00001,c00002&date={date}&order_by=24h&order_type=desc',
+        '/search?name=Coin00001',
+        '/search/autocomplete?prefix=coin0000'
+    ]
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Benchmarks the dashboard, search and ingestion on synthetic data.')
+    parser.add_argument('--currencies', type=int, default=50, help='synthetic currencies')
+    parser.add_argument('--years', type=float, default=1, help='years of daily records per currency')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic data')
+    parser.add_argument('--repeat', type=int, default=5, help='rounds of each micro-benchmark')
+    parser.add_argument('--requests', type=int, default=500, help='requests sent by the load test')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients of the load test')
+    parser.add_argument('--cache', default='none', choices=['none', 'memory'], help='cache backend of the benchmark app')
+    parser.add_argument('--max-queries', type=int, default=5, help='fail if a request issues more SQL statements')
+    parser.add_argument('--url', help='load test a running server instead of an in-process one')
+    parser.add_argument('--output', default='benchmark-results.json', help='JSON file of the results')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    days = int(args.years * 365)
+    date = (START_DATE + timedelta(days=days)).strftime('%Y-%m-%d')
+    paths = request_paths(date)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        folder = workdir / 'csv'
+        folder.mkdir()
+        write_csv_files(folder, args.currencies, days, args.seed)
+
+        app = create_app(benchmark_config(workdir / 'benchmark.db', args.cache)())
+        with app.app_context():
+            db.create_all()
+
+        print(f"[Benchmark] Ingesting {args.currencies} currencies x {days} days")
+        results['ingest'] = bench_ingest(app, folder)
+
+        rows = generate_dashboard_rows(args.currencies, args.seed)
+        results['process_crypto'] = bench_process_crypto(rows, args.repeat)
+        results['order_crypto'] = bench_order_crypto(rows, args.repeat)
+
+        with app.app_context():
+            results['queries'] = queries_per_request(app, db.engine, paths)
+
+        print(f"[Benchmark] Sending {args.requests} requests from {args.concurrency} clients")
+        if args.url:
+            results['load'] = run_load(args.url, paths, args.requests, args.concurrency)
+        else:
+            server = serve(app)
+            try:
+                results['load'] = run_load(f'http://127.0.0.1:{server.port}', paths, args.requests, args.concurrency)
+            finally:
+                server.shutdown()
+
+    report = {
+        'created_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'parameters': vars(args),
+        'results': results
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+    print(f"[Benchmark] Results written to {args.output}")
+
+    # Fail on N+1 regressions, when a request issues more statements than allowed
+    excessive = {path: count for path, count in results['queries'].items() if count > args.max_queries}
+    if excessive:
+        print(f"[Benchmark] Too many SQL statements per request: {excessive}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
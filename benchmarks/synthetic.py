@@ -0,0 +1,54 @@
+# benchmarks/synthetic.py
+
+import random
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+CSV_HEADER = 'SNo,Name,Symbol,Date,High,Low,Open,Close,Volume,Marketcap'
+
+# First day of the synthetic records
+START_DATE = datetime(2018, 1, 1)
+
+# Row of the dashboard query (see dashboard_query in app/routes.py)
+DashboardRow = namedtuple('DashboardRow', ['currency_id', 'name', 'symbol', 'price', 'change_24h', 'change_7d', 'change_1m', 'volume', 'marketcap', 'full_window'])
+
+# Returns the (name, symbol) pairs of count synthetic currencies
+def generate_currencies(count):
+    return [(f'Coin{i:05d}', f'C{i:05d}') for i in range(count)]
+
+# Yields the daily (date, high, low, open, close, volume, marketcap) of a currency as a random walk, deterministic for a seed
+def generate_candles(seed, days, start_date=START_DATE):
+    rng = random.Random(seed)
+    price = rng.uniform(1, 1000)
+    supply = rng.uniform(1e6, 1e9)
+    for day in range(days):
+        open_price = price
+        price = max(price * (1 + rng.gauss(0, 0.03)), 0.0001)
+        high = max(open_price, price) * (1 + rng.uniform(0, 0.02))
+        low = min(open_price, price) * (1 - rng.uniform(0, 0.02))
+        volume = rng.uniform(1e5, 1e9)
+        yield start_date + timedelta(days=day), high, low, open_price, price, volume, price * supply
+
+# Writes one CSV per currency in the source format (a preamble row, the header and one row per day) and returns the paths
+def write_csv_files(folder, currencies, days, seed=0, start_date=START_DATE):
+    paths = []
+    for name, symbol in generate_currencies(currencies):
+        lines = [f'{name} historical prices', CSV_HEADER]
+        for number, (date, high, low, open_price, close, volume, marketcap) in enumerate(generate_candles(f'{seed}:{symbol}', days, start_date), start=1):
+            lines.append(f"{number},{name},{symbol},{date.strftime('%Y-%m-%d 23:59:59')},{high:.6f},{low:.6f},{open_price:.6f},{close:.6f},{volume:.2f},{marketcap:.2f}")
+        path = folder / f'coin_{name}.csv'
+        path.write_text('\n'.join(lines) + '\n')
+        paths.append(path)
+    return paths
+
+# Returns count rows as read by the dashboard query, deterministic for a seed
+def generate_dashboard_rows(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        DashboardRow(
+            position + 1, name, symbol, rng.uniform(1, 1000),
+            rng.gauss(0, 5), rng.gauss(0, 10), rng.gauss(0, 20),
+            rng.uniform(1e5, 1e9), rng.uniform(1e6, 1e11), True
+        )
+        for position, (name, symbol) in enumerate(generate_currencies(count))
+    ]
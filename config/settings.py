@@ -14,7 +14,32 @@ class Config:
     CSV_FILE_FOLDER = os.getenv("CSV_FILE_FOLDER")
     SQLALCHEMY_DATABASE_URI = f"postgresql://{DB_USERNAME}:{DB_PASSWORD}@{DB_ENDPOINT}/{DB_NAME}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False  # Disable Flask-SQLAlchemy
+    REPLICA_DATABASE_URIS = [uri for uri in os.getenv("REPLICA_DATABASE_URIS", "").split(",") if uri]  # Comma-separated read replicas of the read endpoints
+    REPLICA_RETRY_SECONDS = int(os.getenv("REPLICA_RETRY_SECONDS", 30))  # Seconds a failed replica is skipped before it is tried again
+    ASYNC_DATABASE_URI = os.getenv("ASYNC_DATABASE_URI")  # Defaults to SQLALCHEMY_DATABASE_URI with an async driver
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))  # Connections kept open by the async engine
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))  # Extra connections allowed under bursts
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Seconds before a connection is replaced
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a free connection
+    BOOTSTRAP_IN_BACKGROUND = os.getenv("BOOTSTRAP_IN_BACKGROUND", "false").lower() == "true"  # Load the data in a thread at start-up
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 10000))  # Rows per COPY/executemany batch
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 0))  # CSV parsing processes, 0 for one per CPU
+    INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", 0))  # Rows per streamed CSV chunk, 0 to read whole files
+    DASHBOARD_STORE = os.getenv("DASHBOARD_STORE", "sql")  # "sql" or "memory" (NumPy arrays loaded at start-up)
+    DASHBOARD_SNAPSHOT = os.getenv("DASHBOARD_SNAPSHOT")  # Memory-mapped snapshot file shared by the workers of the memory store
+    ANALYTICS_MAX_WINDOW = int(os.getenv("ANALYTICS_MAX_WINDOW", 365))  # Most days of closes an analytics request may load
+    MARKET_TOP_N = int(os.getenv("MARKET_TOP_N", 10))  # Largest currencies summed in the top dominance of the market rollup
+    JSON_STREAM_ROWS = int(os.getenv("JSON_STREAM_ROWS", 1000))  # Lists at least this long are streamed, 0 to never stream
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # Measure the requests served on /metrics
+    METRICS_SLOW_REQUEST_SECONDS = float(os.getenv("METRICS_SLOW_REQUEST_SECONDS", 0))  # Log slower requests with their SQL, 0 to disable
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # "none", "memory" (per-process LRU) or "redis" (shared)
+    CACHE_SIZE = int(os.getenv("CACHE_SIZE", 1024))  # Maximum entries of the in-process LRU cache
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 300))  # Seconds before a cached response expires
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    DATA_VERSION_CHECK_SECONDS = float(os.getenv("DATA_VERSION_CHECK_SECONDS", 5))  # Seconds between checks for data changed by another process
 
 class TestConfig(Config):
     TESTING = True
+    DASHBOARD_SNAPSHOT = None  # Tests opt in with a temporary file, never the environment's snapshot
+    CACHE_BACKEND = "none"
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
\ No newline at end of file
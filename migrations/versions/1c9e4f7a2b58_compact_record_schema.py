@@ -0,0 +1,120 @@
+"""Compact record schema
+
+Revision ID: 1c9e4f7a2b58
+Revises: f5a03c81d6b2
+Create Date: 2026-10-18 16:05:52.730941
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c9e4f7a2b58'
+down_revision = 'f5a03c81d6b2'
+branch_labels = None
+depends_on = None
+
+VALUE_COLUMNS = 'high, low, open, close, volume, marketcap'
+
+
+def is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+# Creates one partition per year of the records on PostgreSQL, plus a default partition
+def create_partitions(table, prefix):
+    first_year, last_year = op.get_bind().execute(sa.text(
+        "SELECT EXTRACT(YEAR FROM MIN(date))::int, EXTRACT(YEAR FROM MAX(date))::int FROM record"
+    )).one()
+    if first_year is not None:
+        for year in range(first_year, last_year + 1):
+            op.execute(
+                f"CREATE TABLE {prefix}_y{year} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+    op.execute(f"CREATE TABLE {prefix}_default PARTITION OF {table} DEFAULT")
+
+
+# Renames the partitions of the new table once the old table and its partitions are dropped
+def rename_partitions(prefix):
+    partitions = op.get_bind().execute(sa.text(
+        "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'record'::regclass"
+    )).scalars().all()
+    for partition in partitions:
+        op.execute(f"ALTER TABLE {partition} RENAME TO {partition.replace(prefix, 'record', 1)}")
+
+
+def upgrade():
+    postgresql = is_postgresql()
+
+    # (currency_id, date) is the primary key, which also includes the partition key on PostgreSQL
+    op.create_table('record_compact',
+    sa.Column('currency_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('high', sa.Float(), nullable=True),
+    sa.Column('low', sa.Float(), nullable=True),
+    sa.Column('open', sa.Float(), nullable=True),
+    sa.Column('close', sa.Float(), nullable=False),
+    sa.Column('volume', sa.Float(), nullable=True),
+    sa.Column('marketcap', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('currency_id', 'date', name='record_compact_pkey'),
+    postgresql_partition_by='RANGE (date)'
+    )
+    if postgresql:
+        create_partitions('record_compact', 'record_compact')
+
+    # Keep the latest row of each currency and day, dropping the rows without a currency, date or close
+    op.execute(
+        f"INSERT INTO record_compact (currency_id, date, {VALUE_COLUMNS}) "
+        f"SELECT currency_id, day, {VALUE_COLUMNS} FROM ("
+        f"SELECT currency_id, date(date) AS day, {VALUE_COLUMNS}, "
+        f"ROW_NUMBER() OVER (PARTITION BY currency_id, date(date) ORDER BY date DESC) AS position "
+        f"FROM record WHERE currency_id IS NOT NULL AND date IS NOT NULL AND close IS NOT NULL"
+        f") ranked WHERE position = 1"
+    )
+
+    op.drop_table('record')
+    op.rename_table('record_compact', 'record')
+    if postgresql:
+        op.execute("ALTER TABLE record RENAME CONSTRAINT record_compact_pkey TO record_pkey")
+        rename_partitions('record_compact')
+
+
+def downgrade():
+    postgresql = is_postgresql()
+
+    # The surrogate key is alone on SQLite, so it stays an auto-incremented rowid
+    op.create_table('record_wide',
+    sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+    sa.Column('currency_id', sa.Integer(), nullable=True),
+    sa.Column('date', sa.DateTime(), nullable=True),
+    sa.Column('high', sa.Float(), nullable=True),
+    sa.Column('low', sa.Float(), nullable=True),
+    sa.Column('open', sa.Float(), nullable=True),
+    sa.Column('close', sa.Float(), nullable=True),
+    sa.Column('volume', sa.Float(), nullable=True),
+    sa.Column('marketcap', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint(*(['id', 'date'] if postgresql else ['id']), name='record_wide_pkey'),
+    postgresql_partition_by='RANGE (date)'
+    )
+    if postgresql:
+        create_partitions('record_wide', 'record_wide')
+
+    # The days become timestamps at the end of the day, as in the source files
+    op.execute(
+        f"INSERT INTO record_wide (currency_id, date, {VALUE_COLUMNS}) "
+        f"SELECT currency_id, date + INTERVAL '1 day' - INTERVAL '1 second', {VALUE_COLUMNS} FROM record ORDER BY currency_id, date"
+        if postgresql else
+        f"INSERT INTO record_wide (currency_id, date, {VALUE_COLUMNS}) "
+        f"SELECT currency_id, datetime(date, '+86399 seconds'), {VALUE_COLUMNS} FROM record ORDER BY currency_id, date"
+    )
+
+    op.drop_table('record')
+    op.rename_table('record_wide', 'record')
+    op.create_index('ix_record_currency_id_date', 'record', ['currency_id', 'date'], unique=True)
+    if postgresql:
+        op.execute("ALTER TABLE record RENAME CONSTRAINT record_wide_pkey TO record_pkey")
+        rename_partitions('record_wide')
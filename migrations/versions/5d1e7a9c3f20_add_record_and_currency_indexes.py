@@ -0,0 +1,36 @@
+"""Add record and currency indexes
+
+Revision ID: 5d1e7a9c3f20
+Revises: 8bec3f856012
+Create Date: 2026-10-18 09:12:44.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1e7a9c3f20'
+down_revision = '8bec3f856012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove duplicate day rows so the unique index can be built, keeping the first one loaded
+    op.execute(
+        "DELETE FROM record WHERE id NOT IN "
+        "(SELECT MIN(id) FROM record GROUP BY currency_id, date)"
+    )
+
+    op.create_index('ix_record_currency_id_date', 'record', ['currency_id', 'date'], unique=True)
+
+    # Expression indexes are supported by both PostgreSQL and SQLite (3.9+)
+    op.create_index('ix_currency_lower_name', 'currency', [sa.text('lower(name)')])
+    op.create_index('ix_currency_lower_symbol', 'currency', [sa.text('lower(symbol)')])
+
+
+def downgrade():
+    op.drop_index('ix_currency_lower_symbol', table_name='currency')
+    op.drop_index('ix_currency_lower_name', table_name='currency')
+    op.drop_index('ix_record_currency_id_date', table_name='record')
@@ -0,0 +1,34 @@
+"""Create market metric table
+
+Revision ID: 7d2a9c4e1f63
+Revises: 1c9e4f7a2b58
+Create Date: 2026-10-18 17:21:48.305126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2a9c4e1f63'
+down_revision = '1c9e4f7a2b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('market_metric',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('total_marketcap', sa.Float(), nullable=True),
+    sa.Column('total_volume', sa.Float(), nullable=True),
+    sa.Column('currencies', sa.Integer(), nullable=True),
+    sa.Column('top_marketcap', sa.Float(), nullable=True),
+    sa.Column('leader_id', sa.Integer(), nullable=True),
+    sa.Column('leader_marketcap', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['leader_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('date')
+    )
+
+
+def downgrade():
+    op.drop_table('market_metric')
@@ -0,0 +1,29 @@
+"""Create data version table
+
+Revision ID: 9e4b1d7c2a85
+Revises: 7d2a9c4e1f63
+Create Date: 2026-10-18 19:12:05.516873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b1d7c2a85'
+down_revision = '7d2a9c4e1f63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_version = op.create_table('data_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(data_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('data_version')
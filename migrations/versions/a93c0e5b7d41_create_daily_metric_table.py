@@ -0,0 +1,36 @@
+"""Create daily metric table
+
+Revision ID: a93c0e5b7d41
+Revises: 5d1e7a9c3f20
+Create Date: 2026-10-18 10:02:31.904718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a93c0e5b7d41'
+down_revision = '5d1e7a9c3f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_metric',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('currency_id', sa.Integer(), nullable=False),
+    sa.Column('close', sa.Float(), nullable=True),
+    sa.Column('change_24h', sa.Float(), nullable=True),
+    sa.Column('change_7d', sa.Float(), nullable=True),
+    sa.Column('change_1m', sa.Float(), nullable=True),
+    sa.Column('volume', sa.Float(), nullable=True),
+    sa.Column('marketcap', sa.Float(), nullable=True),
+    sa.Column('full_window', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('date', 'currency_id')
+    )
+
+
+def downgrade():
+    op.drop_table('daily_metric')
@@ -0,0 +1,32 @@
+"""Create ingest file table
+
+Revision ID: c4f81b26e9d3
+Revises: a93c0e5b7d41
+Create Date: 2026-10-18 11:24:05.561390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f81b26e9d3'
+down_revision = 'a93c0e5b7d41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ingest_file',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('currency_id', sa.Integer(), nullable=True),
+    sa.Column('last_date', sa.DateTime(), nullable=True),
+    sa.Column('ingested_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('ingest_file')
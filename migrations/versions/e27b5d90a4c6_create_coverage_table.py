@@ -0,0 +1,51 @@
+"""Create coverage table
+
+Revision ID: e27b5d90a4c6
+Revises: c4f81b26e9d3
+Create Date: 2026-10-18 13:02:41.118204
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27b5d90a4c6'
+down_revision = 'c4f81b26e9d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    coverage = op.create_table('coverage',
+    sa.Column('currency_id', sa.Integer(), nullable=False),
+    sa.Column('first_date', sa.Date(), nullable=True),
+    sa.Column('last_date', sa.Date(), nullable=True),
+    sa.Column('ranges', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ),
+    sa.PrimaryKeyConstraint('currency_id')
+    )
+
+    # Backfill the day ranges of the existing records, reading them in currency and date order
+    record = sa.table('record', sa.column('currency_id', sa.Integer), sa.column('date', sa.DateTime))
+    rows = op.get_bind().execute(sa.select(record.c.currency_id, record.c.date).order_by(record.c.currency_id, record.c.date))
+    ranges = {}
+    for currency_id, date in rows:
+        currency_ranges = ranges.setdefault(currency_id, [])
+        day = date.date()
+        if currency_ranges and (day - currency_ranges[-1][1]).days <= 1:
+            currency_ranges[-1][1] = day
+        else:
+            currency_ranges.append([day, day])
+
+    op.bulk_insert(coverage, [{
+        'currency_id': currency_id,
+        'first_date': currency_ranges[0][0],
+        'last_date': currency_ranges[-1][1],
+        'ranges': json.dumps([[first.isoformat(), last.isoformat()] for first, last in currency_ranges])
+    } for currency_id, currency_ranges in ranges.items()])
+
+
+def downgrade():
+    op.drop_table('coverage')
@@ -0,0 +1,94 @@
+"""Partition record table by year
+
+Revision ID: f5a03c81d6b2
+Revises: e27b5d90a4c6
+Create Date: 2026-10-18 14:37:09.482615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5a03c81d6b2'
+down_revision = 'e27b5d90a4c6'
+branch_labels = None
+depends_on = None
+
+COLUMNS = 'id, currency_id, date, high, low, open, close, volume, marketcap'
+
+
+# Declarative partitioning is PostgreSQL only, SQLite keeps the plain table
+def is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if not is_postgresql():
+        return
+
+    op.execute("ALTER TABLE record RENAME TO record_unpartitioned")
+    op.execute("ALTER INDEX ix_record_currency_id_date RENAME TO ix_record_unpartitioned_currency_id_date")
+    op.execute("ALTER TABLE record_unpartitioned RENAME CONSTRAINT record_pkey TO record_unpartitioned_pkey")
+
+    # The primary key of a partitioned table must include the partition key
+    op.execute("""
+        CREATE TABLE record (
+            id INTEGER NOT NULL DEFAULT nextval('record_id_seq'),
+            currency_id INTEGER REFERENCES currency (id),
+            date TIMESTAMP WITHOUT TIME ZONE,
+            high DOUBLE PRECISION,
+            low DOUBLE PRECISION,
+            open DOUBLE PRECISION,
+            close DOUBLE PRECISION,
+            volume DOUBLE PRECISION,
+            marketcap DOUBLE PRECISION,
+            PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+    """)
+    op.execute("CREATE UNIQUE INDEX ix_record_currency_id_date ON record (currency_id, date)")
+
+    # One partition per year of the existing records (new years are created by the ingestion),
+    # plus a default partition for rows outside of them
+    first_year, last_year = op.get_bind().execute(sa.text(
+        "SELECT EXTRACT(YEAR FROM MIN(date))::int, EXTRACT(YEAR FROM MAX(date))::int FROM record_unpartitioned"
+    )).one()
+    if first_year is not None:
+        for year in range(first_year, last_year + 1):
+            op.execute(
+                f"CREATE TABLE record_y{year} PARTITION OF record "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+    op.execute("CREATE TABLE record_default PARTITION OF record DEFAULT")
+
+    op.execute(f"INSERT INTO record ({COLUMNS}) SELECT {COLUMNS} FROM record_unpartitioned")
+    op.execute("ALTER SEQUENCE record_id_seq OWNED BY record.id")
+    op.execute("DROP TABLE record_unpartitioned")
+
+
+def downgrade():
+    if not is_postgresql():
+        return
+
+    op.execute("ALTER TABLE record RENAME TO record_partitioned")
+    op.execute("ALTER INDEX ix_record_currency_id_date RENAME TO ix_record_partitioned_currency_id_date")
+    op.execute("ALTER TABLE record_partitioned RENAME CONSTRAINT record_pkey TO record_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE record (
+            id INTEGER NOT NULL DEFAULT nextval('record_id_seq'),
+            currency_id INTEGER REFERENCES currency (id),
+            date TIMESTAMP WITHOUT TIME ZONE,
+            high DOUBLE PRECISION,
+            low DOUBLE PRECISION,
+            open DOUBLE PRECISION,
+            close DOUBLE PRECISION,
+            volume DOUBLE PRECISION,
+            marketcap DOUBLE PRECISION,
+            CONSTRAINT record_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO record ({COLUMNS}) SELECT {COLUMNS} FROM record_partitioned")
+    op.execute("ALTER SEQUENCE record_id_seq OWNED BY record.id")
+    # Dropping the partitioned table drops its partitions
+    op.execute("DROP TABLE record_partitioned")
+    op.execute("CREATE UNIQUE INDEX ix_record_currency_id_date ON record (currency_id, date)")
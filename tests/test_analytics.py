@@ -0,0 +1,28 @@
+# tests/test_analytics.py
+
+import numpy as np
+from app.analytics import correlation_matrix, log_returns, ema, sma, volatility, TRADING_DAYS
+
+# Test for matching the pairwise correlations of NumPy, skipping the days a currency has no return
+def test_correlation_matrix():
+    returns = np.random.default_rng(0).normal(size=(60, 5))
+    assert np.allclose(correlation_matrix(returns), np.corrcoef(returns, rowvar=False))
+
+    returns[:10, 0] = np.nan
+    returns[:, 4] = 0.01
+    correlation = correlation_matrix(returns)
+    assert np.isclose(correlation[0, 1], np.corrcoef(returns[10:, 0], returns[10:, 1])[0, 1])
+    assert np.isnan(correlation[4]).all()
+
+# Test for the moving averages and volatility along each currency's closes
+def test_rolling_statistics():
+    closes = np.array([[1.0, 10.0], [2.0, np.nan], [4.0, 12.0], [8.0, 13.0]])
+    assert np.allclose(sma(closes, 2)[:, 0], [np.nan, 1.5, 3, 6], equal_nan=True)
+    assert np.isnan(sma(closes, 2)[1:3, 1]).all()
+
+    # The EMA keeps its last value over a missing day
+    assert np.allclose(ema(closes, 3)[:, 1], [10, 10, 11, 12])
+
+    # Doubling every day is a constant log return, hence no volatility
+    assert np.allclose(volatility(closes, 2)[:, 0], [np.nan, np.nan, 0, 0], equal_nan=True)
+    assert np.isclose(volatility(closes, 3)[3, 1], np.std(log_returns(closes)[:, 1][1:], ddof=1) * np.sqrt(TRADING_DAYS), equal_nan=True)
@@ -3,7 +3,10 @@
 import pytest
 from config.settings import TestConfig
 from datetime import datetime, timedelta
-from app.models import Currency, Record
+from app.models import Currency, Record, DailyMetric
+from utilities.helper import refresh_daily_metrics, refresh_coverage, refresh_market_metrics
+from app.store import store
+from app.cache import LRUCache
 from app import create_app, db
 
 # Fixture to create the Flask app for testing
@@ -22,10 +25,12 @@ def app():
         # Add test data for Record
         current_time = datetime.utcnow()
         thirty_days_ago = current_time - timedelta(days=30)
-        bitcoin_records = [Record(currency_id=bitcoin.id, date=current_time - timedelta(days=i), close=100 + i, volume=1000 + i, marketcap=10000 + i) for i in range(31)]
-        ethereum_records = [Record(currency_id=ethereum.id, date=current_time - timedelta(days=i), close=50 + i, volume=500 + i, marketcap=5000 + i) for i in range(31)]
+        bitcoin_records = [Record(currency_id=bitcoin.id, date=(current_time - timedelta(days=i)).date(), close=100 + i, volume=1000 + i, marketcap=10000 + i) for i in range(31)]
+        ethereum_records = [Record(currency_id=ethereum.id, date=(current_time - timedelta(days=i)).date(), close=50 + i, volume=500 + i, marketcap=5000 + i) for i in range(31)]
         db.session.add_all(bitcoin_records + ethereum_records)
         db.session.commit()
+        refresh_coverage()
+        refresh_market_metrics()
 
         yield app
 
@@ -52,11 +57,240 @@ def test_search_crypto_prices_favourite(client):
     assert len(response.json) == 1
     assert all(key in response.json[0] for key in ['crypto', 'price', '24h', '7d', '1m', '24h-volume', 'market-cap'])
 
+# Test for computing the dashboard values from the latest records of the window
+def test_search_crypto_prices_values(client):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    response = client.get(f'/dashboard?id=btc,ETH&date={current_date}&order_by=symbol&order_type=asc')
+    assert response.status_code == 200
+    assert [entry['symbol'] for entry in response.json] == ['ETH', 'btc']
+    bitcoin = response.json[1]
+    assert bitcoin['price'] == 101
+    assert bitcoin['24h'] == pytest.approx((101 - 102) / 102 * 100)
+    assert bitcoin['7d'] == pytest.approx((101 - 108) / 108 * 100)
+    assert bitcoin['1m'] == pytest.approx((101 - 130) / 130 * 100)
+    assert bitcoin['24h-volume'] == 1001
+    assert bitcoin['market-cap'] == 10001
+
+# Test for serving the dashboard from the precomputed daily snapshot
+def test_search_crypto_prices_snapshot(app, client):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    url = f'/dashboard?id=all&date={current_date}&order_by=market-cap&order_type=desc'
+    live_response = client.get(url)
+
+    with app.app_context():
+        refresh_daily_metrics()
+        metrics = DailyMetric.query.filter_by(date=datetime.now().date()).all()
+        assert len(metrics) == 2
+        assert all(metric.full_window for metric in metrics)
+
+    snapshot_response = client.get(url)
+    assert snapshot_response.status_code == 200
+    assert snapshot_response.json == live_response.json
+
+# Test for serving the dashboard from the in-memory store, which must agree with the SQL path
+@pytest.mark.parametrize('crypto_id,order_by,order_type', [
+    ('all', 'price', 'asc'),
+    ('all', 'crypto', 'desc'),
+    ('eth,BTC', '24h', 'desc'),
+    ('btc', 'market-cap', 'asc')
+])
+def test_search_crypto_prices_memory_store(app, client, crypto_id, order_by, order_type):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    url = f'/dashboard?id={crypto_id}&date={current_date}&order_by={order_by}&order_type={order_type}'
+    sql_response = client.get(url)
+
+    with app.app_context():
+        store.load()
+    app.config['DASHBOARD_STORE'] = 'memory'
+    try:
+        memory_response = client.get(url)
+        missing_response = client.get('/dashboard?id=xxx,btc&date=1999-10-23&order_by=price&order_type=asc')
+    finally:
+        app.config['DASHBOARD_STORE'] = 'sql'
+
+    assert memory_response.status_code == 200
+    assert memory_response.json == pytest.approx(sql_response.json)
+    assert missing_response.status_code == 404
+
+# Test for paging through the dashboard with a limit and the returned cursor, from SQL and the memory store
+@pytest.mark.parametrize('dashboard_store', ['sql', 'memory'])
+def test_search_crypto_prices_pages(app, client, dashboard_store):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    url = f'/dashboard?id=all&date={current_date}&order_by=price&order_type=desc'
+    full_response = client.get(url)
+
+    with app.app_context():
+        store.load()
+    app.config['DASHBOARD_STORE'] = dashboard_store
+    try:
+        first_page = client.get(f'{url}&limit=1')
+        second_page = client.get(f'{url}&limit=1&cursor={first_page.json["next_cursor"]}')
+        wide_page = client.get(f'{url}&limit=5')
+    finally:
+        app.config['DASHBOARD_STORE'] = 'sql'
+
+    assert first_page.status_code == 200
+    assert first_page.json['data'] == pytest.approx(full_response.json[:1])
+    assert second_page.json['data'] == pytest.approx(full_response.json[1:2])
+    assert second_page.json['next_cursor'] is None
+    assert wide_page.json['data'] == pytest.approx(full_response.json)
+    assert wide_page.json['next_cursor'] is None
+
+# Test for rejecting invalid page parameters
+def test_search_crypto_prices_pages_bad_request(client):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    url = f'/dashboard?id=all&date={current_date}&order_by=price&order_type=desc'
+    assert client.get(f'{url}&limit=0').status_code == 400
+    assert client.get(f'{url}&cursor=eyJvZmZzZXQiOiAxfQ==').status_code == 400
+    assert client.get(f'{url}&limit=1&cursor=not-a-cursor').status_code == 400
+
+# Test for serving repeated dashboard and search queries from the cache
+def test_search_crypto_prices_cache(app, client):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    uncached_cache = app.extensions['cache']
+    app.extensions['cache'] = LRUCache(max_size=16, ttl=60)
+    try:
+        first = client.get(f'/dashboard?id=btc,eth&date={current_date}&order_by=price&order_type=asc')
+        second = client.get(f'/dashboard?id=ETH,btc&date={current_date}&order_by=price&order_type=asc')
+        client.get('/search?name=Bitcoin')
+        client.get('/search?name=bitcoin')
+        stats = client.get('/cache').json
+    finally:
+        app.extensions['cache'] = uncached_cache
+
+    assert [entry['symbol'] for entry in first.json] == ['eth', 'btc']
+    assert [entry['symbol'] for entry in second.json] == ['ETH', 'btc']
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+    assert stats['size'] == 2
+
 # Test for searching crypto prices with invalid parameters
 def test_search_crypto_prices_not_found(client):
     response = client.get('/dashboard?id=xxx,btc&date=1999-10-23&order_by=price&order_type=asc')
     assert response.status_code == 404
 
+# Test for getting the daily series of many cryptos
+def test_search_crypto_series_daily(client):
+    start_date = (datetime.utcnow() - timedelta(days=9)).strftime('%Y-%m-%d')
+    end_date = datetime.utcnow().strftime('%Y-%m-%d')
+    response = client.get(f'/series?id=btc,ETH&start={start_date}&end={end_date}')
+    assert response.status_code == 200
+    assert [entry['symbol'] for entry in response.json] == ['btc', 'ETH']
+
+    series = response.json[0]['series']
+    assert len(series) == 10
+    assert series[0]['date'] == start_date
+    assert series[-1] == {'date': end_date, 'open': None, 'high': None, 'low': None, 'close': 100, 'volume': 1000}
+
+# Test for resampling and downsampling the series into candles
+def test_search_crypto_series_candles(client):
+    start_date = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%d')
+    end_date = datetime.utcnow().strftime('%Y-%m-%d')
+    response = client.get(f'/series?id=btc&start={start_date}&end={end_date}&interval=weekly')
+    assert response.status_code == 200
+    weekly = response.json[0]['series']
+    assert all(datetime.strptime(candle['date'], '%Y-%m-%d').weekday() == 0 for candle in weekly)
+    assert sum(candle['volume'] for candle in weekly) == sum(1000 + i for i in range(31))
+    assert weekly[-1]['close'] == 100
+
+    response = client.get(f'/series?id=btc&start={start_date}&end={end_date}&interval=daily&max_points=4')
+    assert len(response.json[0]['series']) == 4
+    assert response.json[0]['series'][0]['close'] == 123
+
+# Test for the columnar format, one array per field with the field names as header
+def test_columnar_format(client):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    url = f'/dashboard?id=all&date={current_date}&order_by=price&order_type=asc'
+    rows = client.get(url).json
+    columnar = client.get(f'{url}&format=columnar').json
+    assert columnar['fields'][:3] == ['crypto', 'symbol', 'price']
+    assert [dict(zip(columnar['fields'], row)) for row in zip(*columnar['columns'])] == rows
+    assert client.get(f'{url}&limit=1&format=columnar').json['data']['columns'][0] == ['Ethereum']
+    assert client.get(f'{url}&format=csv').status_code == 400
+
+    start_date = (datetime.utcnow() - timedelta(days=9)).strftime('%Y-%m-%d')
+    series = client.get(f'/series?id=btc&start={start_date}&end={current_date}&format=columnar').json[0]['series']
+    assert series['fields'] == ['date', 'open', 'high', 'low', 'close', 'volume']
+    assert len(series['columns'][0]) == 10
+
+# Test for streaming long responses, which must match the buffered ones
+def test_streamed_response(app, client):
+    current_date = datetime.now().strftime('%Y-%m-%d')
+    url = f'/dashboard?id=all&date={current_date}&order_by=price&order_type=asc'
+    buffered = client.get(url)
+    app.config['JSON_STREAM_ROWS'] = 1
+    try:
+        streamed = client.get(url)
+    finally:
+        app.config['JSON_STREAM_ROWS'] = TestConfig.JSON_STREAM_ROWS
+
+    assert 'Content-Length' in buffered.headers
+    assert 'Content-Length' not in streamed.headers
+    assert streamed.json == buffered.json
+
+# Test for getting the series with invalid parameters
+def test_search_crypto_series_bad_request(client):
+    assert client.get('/series?id=btc&start=2021-01-02&end=2021-01-01').status_code == 400
+    assert client.get('/series?id=btc&start=2021-01-01&end=2021-01-31&interval=hourly').status_code == 400
+    assert client.get('/series?id=xxx&start=2021-01-01&end=2021-01-31').status_code == 404
+
+# Test for listing the days with records and the valid dashboard dates
+def test_search_crypto_coverage(client):
+    response = client.get('/coverage?id=btc,ETH')
+    assert response.status_code == 200
+    assert [entry['symbol'] for entry in response.json] == ['btc', 'ETH']
+
+    bitcoin = response.json[0]
+    first = (datetime.utcnow() - timedelta(days=30)).date()
+    last = datetime.utcnow().date()
+    assert (bitcoin['first'], bitcoin['last']) == (first.isoformat(), last.isoformat())
+    assert bitcoin['ranges'] == [[first.isoformat(), last.isoformat()]]
+    assert bitcoin['dashboard_ranges'] == [[last.isoformat(), (last + timedelta(days=1)).isoformat()]]
+
+    assert len(client.get('/coverage?id=all').json) == 2
+    assert client.get('/coverage?id=xxx').status_code == 404
+    assert client.get('/coverage').status_code == 400
+
+# Test for the analytics of the cryptos over the days before a date
+def test_search_crypto_analytics(client):
+    current_date = datetime.utcnow().date()
+    response = client.get(f'/analytics?id=btc,ETH&date={current_date}&window=10&period=3')
+    assert response.status_code == 200
+    assert response.json['dates'][-1] == (current_date - timedelta(days=1)).isoformat()
+    bitcoin, ethereum = response.json['crypto']
+    assert (bitcoin['symbol'], ethereum['symbol']) == ('btc', 'ETH')
+    # The closes of the last three days are 103, 102 and 101
+    assert bitcoin['sma'][:2] == [None, None]
+    assert bitcoin['sma'][-1] == pytest.approx(102)
+    assert bitcoin['volatility'][:3] == [None, None, None]
+    assert bitcoin['volatility'][-1] > 0
+    correlation = response.json['correlation']
+    assert correlation[0][0] == pytest.approx(1)
+    assert correlation[0][1] == pytest.approx(correlation[1][0]) and correlation[0][1] > 0.9
+
+# Test for requesting analytics with invalid parameters
+def test_search_crypto_analytics_bad_request(client):
+    current_date = datetime.utcnow().date()
+    assert client.get('/analytics?id=btc').status_code == 400
+    assert client.get('/analytics?id=btc&date=2021-13-01').status_code == 400
+    assert client.get(f'/analytics?id=btc&date={current_date}&window=1').status_code == 400
+    assert client.get(f'/analytics?id=btc&date={current_date}&window=10&period=11').status_code == 400
+    assert client.get(f'/analytics?id=xxx&date={current_date}').status_code == 404
+
+# Test for the market rollup over a date range
+def test_search_market_overview(client):
+    day = (datetime.utcnow() - timedelta(days=1)).date()
+    response = client.get(f'/market?start={day - timedelta(days=1)}&end={day}')
+    assert response.status_code == 200
+    assert [entry['date'] for entry in response.json] == [(day - timedelta(days=1)).isoformat(), day.isoformat()]
+    entry = response.json[-1]
+    assert (entry['market-cap'], entry['volume'], entry['currencies'], entry['top-dominance']) == (15002, 1502, 2, 100)
+    assert entry['leader']['symbol'] == 'BTC'
+    assert entry['leader']['dominance'] == pytest.approx(10001 / 15002 * 100)
+
+    assert client.get('/market?start=2021-01-01').status_code == 400
+    assert client.get(f'/market?start={day}&end={day - timedelta(days=1)}').status_code == 400
+
 # Test for searching crypto existence by name
 def test_search_crypto_exists_name(client):
     response = client.get('/search?name=bitcoin')
@@ -76,6 +310,52 @@ def test_search_crypto_exists_name_not_found(client):
     response = client.get('/search?name=xxx')
     assert response.status_code == 404
 
+# Test for completing a name or symbol prefix
+def test_autocomplete_crypto(client):
+    response = client.get('/search/autocomplete?prefix=e')
+    assert response.status_code == 200
+    assert response.json == [{'name': 'Ethereum', 'symbol': 'ETH'}]
+
+    response = client.get('/search/autocomplete?prefix=xyz')
+    assert response.status_code == 200
+    assert response.json == []
+
+# Test for completing a prefix with invalid parameters
+def test_autocomplete_crypto_bad_request(client):
+    assert client.get('/search/autocomplete').status_code == 400
+    assert client.get('/search/autocomplete?prefix=b&limit=0').status_code == 400
+
+# Test for searching the existence of many cryptos in one call
+def test_search_crypto_exists_batch(client):
+    response = client.get('/search/batch?names=bitcoin,ETH,xxx')
+    assert response.status_code == 200
+    assert response.json == {
+        'bitcoin': {'name': 'Bitcoin', 'symbol': 'BTC'},
+        'ETH': {'name': 'Ethereum', 'symbol': 'ETH'},
+        'xxx': None
+    }
+
+# Test for the liveness and readiness probes
+def test_health_probes(client):
+    assert client.get('/healthz').json == {'status': 'ok'}
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ready'
+    assert response.json['bootstrap']['stage'] == 'idle'
+
+# Test for answering the probes before the tables exist, as while the database is down or not migrated
+def test_health_probes_without_tables():
+    client = create_app(TestConfig()).test_client()
+    assert client.get('/healthz').json == {'status': 'ok'}
+
+    response = client.get('/readyz')
+    assert response.status_code == 503
+    assert response.json['status'] == 'unavailable'
+
+    # The data version cannot be read either, which leaves the endpoints without database queries up
+    assert client.get('/cache').status_code == 200
+
 # Test for handling bad request
 def test_bad_request(client):
     response = client.get('/xxx')
@@ -0,0 +1,148 @@
+# tests/test_asgi.py
+
+import json
+import asyncio
+import pytest
+from config.settings import TestConfig
+from datetime import datetime, timedelta
+from app.models import Currency, Record
+from app.asgi import AsyncApp
+from utilities.helper import refresh_coverage, refresh_market_metrics, refresh_serving_data
+from app import create_app, db
+
+# Calls the ASGI app with a GET request, returning the status and the decoded JSON body
+async def asgi_get(asgi_app, path, query_string=''):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string.encode()}
+    await asgi_app(scope, receive, send)
+    return messages[0]['status'], json.loads(b''.join(message['body'] for message in messages[1:]))
+
+# Fixture to create a file-backed SQLite database shared by the Flask and ASGI apps
+@pytest.fixture(scope='module')
+def config(tmp_path_factory):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path_factory.mktemp('asgi') / 'krispyto.db'}"
+
+    app = create_app(FileConfig())
+    with app.app_context():
+        db.create_all()
+        bitcoin = Currency(name='Bitcoin', symbol='BTC')
+        ethereum = Currency(name='Ethereum', symbol='ETH')
+        db.session.add_all([bitcoin, ethereum])
+        db.session.commit()
+
+        current_time = datetime.utcnow()
+        db.session.add_all(
+            [Record(currency_id=bitcoin.id, date=(current_time - timedelta(days=i)).date(), close=100 + i, volume=1000 + i, marketcap=10000 + i) for i in range(31)] +
+            [Record(currency_id=ethereum.id, date=(current_time - timedelta(days=i)).date(), close=50 + i, volume=500 + i, marketcap=5000 + i) for i in range(31)]
+        )
+        db.session.commit()
+        refresh_coverage()
+        refresh_market_metrics()
+
+    return FileConfig, app
+
+# Test for serving the same JSON contract as the Flask endpoints
+@pytest.mark.parametrize('path,query_string', [
+    ('/dashboard', f"id=all&date={datetime.now().strftime('%Y-%m-%d')}&order_by=price&order_type=asc"),
+    ('/dashboard', f"id=btc,eth&date={datetime.now().strftime('%Y-%m-%d')}&order_by=24h&order_type=desc"),
+    ('/dashboard', 'id=xxx,btc&date=1999-10-23&order_by=price&order_type=asc'),
+    ('/dashboard', 'id=btc&date=1999-10-23&order_by=xxx&order_type=asc'),
+    ('/dashboard', f"id=all&date={datetime.now().strftime('%Y-%m-%d')}&order_by=price&order_type=asc&format=columnar"),
+    ('/series', f"id=btc&start={(datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%d')}&end={datetime.utcnow().strftime('%Y-%m-%d')}&interval=weekly"),
+    ('/analytics', f"id=all&date={datetime.utcnow().strftime('%Y-%m-%d')}&window=20&period=5"),
+    ('/market', f"start={(datetime.utcnow() - timedelta(days=10)).strftime('%Y-%m-%d')}&end={datetime.utcnow().strftime('%Y-%m-%d')}"),
+    ('/coverage', 'id=eth,BTC'),
+    ('/search', 'name=bitcoin'),
+    ('/search', 'name=xxx'),
+    ('/search/autocomplete', 'prefix=b'),
+    ('/search/batch', 'names=btc,xxx')
+])
+def test_asgi_matches_flask(config, path, query_string):
+    config_class, app = config
+    flask_response = app.test_client().get(f'{path}?{query_string}')
+
+    status, response_data = asyncio.run(asgi_get(AsyncApp(config_class), path, query_string))
+    assert status == flask_response.status_code
+    assert response_data == flask_response.json
+
+# Test for serving concurrent requests and handling unknown paths
+def test_asgi_concurrent_requests(config):
+    config_class, _ = config
+    asgi_app = AsyncApp(config_class)
+    query_string = f"id=all&date={datetime.now().strftime('%Y-%m-%d')}&order_by=market-cap&order_type=desc"
+
+    async def run():
+        responses = await asyncio.gather(*(asgi_get(asgi_app, '/dashboard', query_string) for _ in range(20)))
+        missing = await asgi_get(asgi_app, '/xxx')
+        health = await asgi_get(asgi_app, '/healthz')
+        await asgi_app.engine.dispose()
+        return responses, missing, health
+
+    responses, missing, health = asyncio.run(run())
+    assert health == (200, {'status': 'ok'})
+    assert all(status == 200 and response_data == responses[0][1] for status, response_data in responses)
+    assert [entry['crypto'] for entry in responses[0][1]] == ['Bitcoin', 'Ethereum']
+    assert missing == (404, {'error': 'Bad request.'})
+
+# Test for answering the probes before the tables exist
+def test_asgi_health_probes_without_tables(tmp_path):
+    class EmptyConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'empty.db'}"
+
+    async def run():
+        asgi_app = AsyncApp(EmptyConfig)
+        responses = await asgi_get(asgi_app, '/healthz'), await asgi_get(asgi_app, '/readyz')
+        await asgi_app.engine.dispose()
+        return responses
+
+    health, ready = asyncio.run(run())
+    assert health == (200, {'status': 'ok'})
+    assert ready[0] == 503 and ready[1]['status'] == 'unavailable'
+
+# Test for streaming long lists in several body messages
+def test_asgi_streaming(config):
+    config_class, app = config
+
+    class StreamingConfig(config_class):
+        JSON_STREAM_ROWS = 1
+
+    query_string = f"id=all&date={datetime.now().strftime('%Y-%m-%d')}&order_by=price&order_type=asc"
+    status, response_data = asyncio.run(asgi_get(AsyncApp(StreamingConfig), '/dashboard', query_string))
+    assert status == 200
+    assert response_data == app.test_client().get(f'/dashboard?{query_string}').json
+
+# Test for reloading the search index after another process added currencies
+def test_asgi_reloads_after_data_change(tmp_path):
+    class ChangingConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'krispyto.db'}"
+        DATA_VERSION_CHECK_SECONDS = 0
+
+    app = create_app(ChangingConfig())
+    with app.app_context():
+        db.create_all()
+    asgi_app = AsyncApp(ChangingConfig)
+
+    async def run(change):
+        before = await asgi_get(asgi_app, '/search', 'name=doge')
+        await asyncio.to_thread(change)
+        after = await asgi_get(asgi_app, '/search', 'name=doge')
+        await asgi_app.engine.dispose()
+        return before, after
+
+    def add_currency():
+        with app.app_context():
+            db.session.add(Currency(name='Dogecoin', symbol='DOGE'))
+            db.session.commit()
+            refresh_serving_data()
+
+    before, after = asyncio.run(run(add_currency))
+    assert before[0] == 404
+    assert after == (200, {'name': 'Dogecoin', 'symbol': 'DOGE'})
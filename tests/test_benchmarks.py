@@ -0,0 +1,71 @@
+# tests/test_benchmarks.py
+
+import json
+import pytest
+from datetime import timedelta
+from config.settings import TestConfig
+from app.models import Currency, Record
+from app import create_app, db
+from utilities.helper import read_files_and_upload
+from benchmarks.synthetic import START_DATE, write_csv_files, generate_dashboard_rows
+from benchmarks.queries import queries_per_request
+from benchmarks.load import percentile, run_load, serve
+from benchmarks.run import request_paths, main
+
+# Fixture to create an empty Flask app for each benchmark test
+@pytest.fixture()
+def app():
+    app = create_app(TestConfig())
+    with app.app_context():
+        db.create_all()
+        yield app
+
+# Test for generating the same synthetic CSVs for a seed, in the format read by the ingestion
+def test_synthetic_csv_files(app, tmp_path):
+    (tmp_path / 'first').mkdir()
+    (tmp_path / 'second').mkdir()
+    first = write_csv_files(tmp_path / 'first', 3, 40, seed=7)
+    second = write_csv_files(tmp_path / 'second', 3, 40, seed=7)
+    assert [path.read_text() for path in first] == [path.read_text() for path in second]
+
+    read_files_and_upload(app, str(tmp_path / 'first'))
+    assert Currency.query.count() == 3
+    assert Record.query.count() == 3 * 40
+    assert len(generate_dashboard_rows(5)) == 5
+
+# Test for issuing the same number of SQL statements per request whatever the number of currencies
+def test_queries_per_request(app, tmp_path):
+    date = (START_DATE + timedelta(days=40)).strftime('%Y-%m-%d')
+    counts = []
+    for currencies in [3, 12]:
+        folder = tmp_path / str(currencies)
+        folder.mkdir()
+        write_csv_files(folder, currencies, 40)
+        read_files_and_upload(app, str(folder))
+        counts.append(queries_per_request(app, db.engine, request_paths(date)))
+
+    assert counts[0] == counts[1]
+    assert all(count <= 2 for count in counts[1].values())
+
+# Test for reporting the latency percentiles of concurrent requests
+def test_run_load(app):
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile([1, 2, 3, 4], 0.99) == 4
+
+    server = serve(app)
+    try:
+        report = run_load(f'http://127.0.0.1:{server.port}', ['/healthz', '/search?name=btc'], 20, 4)
+    finally:
+        server.shutdown()
+    assert report['requests'] == 20
+    assert report['errors'] == 0
+    assert report['p50'] <= report['p95'] <= report['p99']
+
+# Test for writing the benchmark results as JSON
+def test_benchmark_run(tmp_path):
+    output = tmp_path / 'results.json'
+    assert main(['--currencies', '3', '--years', '0.1', '--repeat', '1', '--requests', '10', '--output', str(output)]) == 0
+    results = json.loads(output.read_text())['results']
+    assert results['ingest']['rows'] == 3 * 36
+    assert results['load']['errors'] == 0
+    assert set(results) == {'ingest', 'process_crypto', 'order_crypto', 'queries', 'load'}
@@ -0,0 +1,77 @@
+# tests/test_cache.py
+
+from config.settings import TestConfig
+from app.cache import LRUCache, RedisCache, cache_key, get_cache
+from app import create_app, db
+from utilities.helper import refresh_serving_data
+
+# Local stand-in for the subset of the Redis protocol used by the cache
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+# Test for evicting the least recently used entry beyond the size bound
+def test_lru_cache_eviction():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == (True, 1)
+    cache.set('c', 3)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.get('c') == (True, 3)
+    assert cache.stats()['hits'] == 3
+    assert cache.stats()['misses'] == 1
+
+# Test for expiring entries after their time to live
+def test_lru_cache_ttl():
+    cache = LRUCache(max_size=2, ttl=-1)
+    cache.set('a', 1)
+    assert cache.get('a') == (False, None)
+    assert cache.size() == 0
+
+# Test for sharing entries through the Redis backend and invalidating them all at once
+def test_redis_cache():
+    client = FakeRedis()
+    cache = RedisCache(None, ttl=60, client=client)
+    other_task = RedisCache(None, ttl=60, client=client)
+
+    key = cache_key('search', 'btc')
+    cache.set(key, {'name': 'Bitcoin', 'symbol': 'BTC'})
+    assert other_task.get(key) == (True, {'name': 'Bitcoin', 'symbol': 'BTC'})
+
+    cache.clear()
+    assert other_task.get(key) == (False, None)
+    assert other_task.stats()['hit_rate'] == 0.5
+
+# Test for dropping the cached responses of a worker after another process changed the data
+def test_cache_cleared_by_other_process(tmp_path):
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/shared.db'
+        CACHE_BACKEND = 'memory'
+        DATA_VERSION_CHECK_SECONDS = 0
+
+    worker, ingest = create_app(SharedConfig()), create_app(SharedConfig())
+    with worker.app_context():
+        db.create_all()
+    client = worker.test_client()
+    client.get('/search?name=btc')
+    with worker.app_context():
+        assert get_cache().size() == 1
+
+    with ingest.app_context():
+        refresh_serving_data()
+    client.get('/cache')
+    with worker.app_context():
+        assert get_cache().size() == 0
@@ -0,0 +1,74 @@
+# tests/test_coverage.py
+
+from datetime import date, timedelta
+from config.settings import TestConfig
+from app.models import Currency, Record
+from app.coverage import CoverageIndex, merge_ranges, encode_ranges, dashboard_ranges
+from app import create_app, db
+from utilities.helper import refresh_coverage, refresh_serving_data
+
+# Builds a coverage index of one currency covering the given (first, last) date ranges
+def build_index(ranges):
+    ordinals = [[first.toordinal(), last.toordinal()] for first, last in ranges]
+    return CoverageIndex([('Bitcoin', 'BTC', encode_ranges(ordinals) if ranges else None)])
+
+# Test for merging overlapping and adjacent days into ranges
+def test_merge_ranges():
+    assert merge_ranges([[1, 3], [10, 12]], [4, 5, 8, 11, 13]) == [[1, 5], [8, 8], [10, 13]]
+    assert merge_ranges([], [3, 1, 2]) == [[1, 3]]
+    assert dashboard_ranges([[date(2021, 1, 1).toordinal(), date(2021, 2, 9).toordinal()]]) == [['2021-01-31', '2021-02-10']]
+
+# Test for requiring each of the 30 days before the dashboard date
+def test_has_window():
+    index = build_index([(date(2021, 1, 1), date(2021, 1, 20)), (date(2021, 1, 22), date(2021, 3, 31))])
+    assert not index.has_window(['btc'], date(2021, 1, 31))
+    assert not index.has_window(['btc'], date(2021, 2, 20))
+    assert index.has_window(['btc'], date(2021, 2, 21))
+    assert index.has_window(None, date(2021, 4, 1))
+    assert not index.has_window(['btc'], date(2021, 4, 2))
+    assert not index.has_window(['btc', 'xxx'], date(2021, 3, 1))
+    assert not build_index([]).has_window(None, date(2021, 3, 1))
+
+# Test for serving the dates loaded by another process once the index is reloaded
+def test_dashboard_after_other_process_ingest(tmp_path):
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/shared.db'
+        DATA_VERSION_CHECK_SECONDS = 0
+
+    worker, ingest = create_app(SharedConfig()), create_app(SharedConfig())
+    with worker.app_context():
+        db.create_all()
+    client = worker.test_client()
+    url = '/dashboard?id=btc&date=2021-02-01&order_by=price&order_type=asc'
+    assert client.get(url).status_code == 404
+
+    with ingest.app_context():
+        bitcoin = Currency(name='Bitcoin', symbol='BTC')
+        db.session.add(bitcoin)
+        db.session.flush()
+        db.session.add_all([Record(currency_id=bitcoin.id, date=date(2021, 1, 1) + timedelta(days=i), close=100 + i) for i in range(31)])
+        db.session.commit()
+        refresh_coverage()
+        refresh_serving_data()
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json[0]['price'] == 130
+
+# Test for answering a miss when the records lack days of the index, as on a replica behind the primary
+def test_dashboard_rows_behind_index():
+    app = create_app(TestConfig())
+    with app.app_context():
+        db.create_all()
+        bitcoin = Currency(name='Bitcoin', symbol='BTC')
+        db.session.add(bitcoin)
+        db.session.flush()
+        db.session.add_all([Record(currency_id=bitcoin.id, date=date(2021, 1, 1) + timedelta(days=i), close=100 + i) for i in range(31)])
+        db.session.commit()
+        refresh_coverage()
+
+        Record.query.filter_by(date=date(2021, 1, 15)).delete()
+        db.session.commit()
+
+    response = app.test_client().get('/dashboard?id=all&date=2021-02-01&order_by=price&order_type=asc')
+    assert response.status_code == 404
@@ -1,8 +1,11 @@
 # tests/test_db.py
 
+import re
 import pytest
+from datetime import timedelta
 from sqlalchemy import text, inspect
 from config.settings import Config
+from app.routes import dashboard_query
 from app import create_app, db 
 
 # Fixture to create the Flask app for testing
@@ -47,4 +50,20 @@ def test_first_table_has_data(app):
                 query_result = db.session.execute(text(f"SELECT 1 FROM {first_table_name} LIMIT 1")).fetchone()
                 assert query_result is not None
     except Exception as e:
-        assert False, f"Error connecting to the database: {e}"
\ No newline at end of file
+        assert False, f"Error connecting to the database: {e}"
+
+# Test to check that the 30-day dashboard window only scans the partitions it covers
+def test_dashboard_window_prunes_partitions(app):
+    with app.app_context():
+        partitions = db.session.execute(text(
+            "SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'record'::regclass"
+        )).scalar()
+        if partitions < 3:
+            pytest.skip("The record table is not partitioned over several years.")
+
+        end_date = db.session.execute(text("SELECT MAX(date) FROM record")).scalar()
+        query = dashboard_query(None, end_date - timedelta(days=30), end_date)
+        compiled = query.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+        plan = '\n'.join(row[0] for row in db.session.execute(text(f"EXPLAIN {compiled}")))
+        scanned = set(re.findall(r' on (record_\w+)', plan))
+        assert 1 <= len(scanned) <= 2
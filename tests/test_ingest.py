@@ -0,0 +1,291 @@
+# tests/test_ingest.py
+
+import pytest
+from config.settings import TestConfig
+from datetime import date, datetime, timedelta
+from app.models import Currency, Record, DailyMetric, MarketMetric, IngestFile, Coverage
+from app import create_app, db
+from utilities.helper import read_files_and_upload, refresh_daily_metrics
+from app.routes import dashboard_query
+from benchmarks.queries import count_queries
+from app.store import store, read_snapshot
+
+CSV_HEADER = 'SNo,Name,Symbol,Date,High,Low,Open,Close,Volume,Marketcap'
+
+# Writes a CSV file in the source format: a preamble row, the header and one row per day
+def write_csv(path, name, symbol, start_date, days, base_price):
+    lines = [f'{name} historical prices', CSV_HEADER]
+    for day in range(days):
+        date = (start_date + timedelta(days=day)).strftime('%Y-%m-%d 23:59:59')
+        price = base_price + day
+        lines.append(f'{day + 1},{name},{symbol},{date},{price + 1},{price - 1},{price},{price},{price * 10},{price * 100}')
+    path.write_text('\n'.join(lines) + '\n')
+
+# Fixture to create an empty Flask app for each ingestion test
+@pytest.fixture()
+def app():
+    app = create_app(TestConfig())
+    with app.app_context():
+        db.create_all()
+        yield app
+
+# Fixture to create a folder of CSV files covering 40 days for two currencies
+@pytest.fixture()
+def csv_folder(tmp_path):
+    start_date = datetime(2021, 1, 1)
+    write_csv(tmp_path / 'coin_Bitcoin.csv', 'Bitcoin', 'BTC', start_date, 40, 100)
+    write_csv(tmp_path / 'coin_Ethereum.csv', 'Ethereum', 'ETH', start_date, 40, 50)
+    return tmp_path
+
+# Test for loading every CSV row with typed values, in parallel worker processes
+def test_read_files_and_upload(app, csv_folder):
+    app.config['INGEST_WORKERS'] = 2
+    app.config['INGEST_BATCH_SIZE'] = 7
+    read_files_and_upload(app, str(csv_folder))
+
+    assert {currency.symbol for currency in Currency.query.all()} == {'BTC', 'ETH'}
+    assert app.extensions['search_index'].find('eth') == {'name': 'Ethereum', 'symbol': 'ETH'}
+    assert Record.query.count() == 2 * 40
+    assert app.extensions['metrics'].ingest_rows == 2 * 40
+
+    bitcoin = Currency.query.filter_by(symbol='BTC').one()
+    latest = Record.query.filter_by(currency_id=bitcoin.id).order_by(Record.date.desc()).first()
+    assert latest.date == date(2021, 2, 9)
+    assert (latest.open, latest.close, latest.high, latest.low) == (139, 139, 140, 138)
+    assert (latest.volume, latest.marketcap) == (1390, 13900)
+
+# Test for building the daily snapshot of the loaded records
+def test_read_files_and_upload_snapshot(app, csv_folder):
+    read_files_and_upload(app, str(csv_folder))
+
+    metrics = DailyMetric.query.filter_by(date=datetime(2021, 2, 10).date()).all()
+    assert len(metrics) == 2
+    assert all(metric.full_window for metric in metrics)
+
+# Test for building every day of the snapshot at once, with the rows of the live dashboard query
+def test_refresh_daily_metrics(app, csv_folder):
+    read_files_and_upload(app, str(csv_folder))
+    Record.query.filter_by(date=date(2021, 1, 20)).delete()
+    db.session.commit()
+
+    with count_queries(db.engine) as statements:
+        refresh_daily_metrics(date(2021, 1, 1))
+    assert len(statements) <= 5
+
+    for day in [date(2021, 1, 1), date(2021, 1, 2), date(2021, 1, 21), date(2021, 2, 1), date(2021, 2, 10)]:
+        expected = [(row.currency_id, row.price, row.change_24h, row.change_7d, row.change_1m, bool(row.full_window))
+                    for row in db.session.execute(dashboard_query(None, day - timedelta(days=30), day)) if row.price is not None]
+        metrics = DailyMetric.query.filter_by(date=day).order_by(DailyMetric.currency_id)
+        assert [(metric.currency_id, metric.close, metric.change_24h, metric.change_7d, metric.change_1m, metric.full_window)
+                for metric in metrics] == pytest.approx(expected)
+    assert DailyMetric.query.filter(DailyMetric.date > date(2021, 2, 10)).count() == 0
+
+# Test for aggregating the loaded records of each day into the market rollup
+def test_read_files_and_upload_market(app, csv_folder):
+    app.config['MARKET_TOP_N'] = 1
+    read_files_and_upload(app, str(csv_folder))
+
+    assert MarketMetric.query.count() == 40
+    day = db.session.get(MarketMetric, date(2021, 1, 1))
+    assert (day.total_marketcap, day.total_volume, day.currencies) == (15000, 1500, 2)
+    assert (day.top_marketcap, day.leader_marketcap) == (10000, 10000)
+    assert day.leader_id == Currency.query.filter_by(symbol='BTC').one().id
+
+# Test for skipping unchanged files and loading only the new days of a changed file
+def test_read_files_and_upload_incremental(app, csv_folder):
+    read_files_and_upload(app, str(csv_folder))
+    read_files_and_upload(app, str(csv_folder))
+    assert Record.query.count() == 2 * 40
+
+    write_csv(csv_folder / 'coin_Bitcoin.csv', 'Bitcoin', 'BTC', datetime(2021, 1, 1), 45, 100)
+    read_files_and_upload(app, str(csv_folder))
+    assert Record.query.count() == 2 * 40 + 5
+
+    bitcoin = db.session.get(IngestFile, 'coin_Bitcoin.csv')
+    assert bitcoin.last_date == datetime(2021, 2, 14)
+
+    # The new days extend the coverage range of the currency
+    coverage = db.session.get(Coverage, bitcoin.currency_id)
+    assert (coverage.first_date, coverage.last_date) == (datetime(2021, 1, 1).date(), datetime(2021, 2, 14).date())
+    assert coverage.ranges == '[["2021-01-01", "2021-02-14"]]'
+
+# Test for upserting rows that are already loaded instead of duplicating them
+def test_read_files_and_upload_upsert(app, csv_folder):
+    read_files_and_upload(app, str(csv_folder))
+
+    # Forget the checkpoints and reload changed prices for the same days
+    IngestFile.query.delete()
+    db.session.commit()
+    write_csv(csv_folder / 'coin_Bitcoin.csv', 'Bitcoin', 'BTC', datetime(2021, 1, 1), 40, 200)
+    read_files_and_upload(app, str(csv_folder))
+
+    assert Record.query.count() == 2 * 40
+    bitcoin = Currency.query.filter_by(symbol='BTC').one()
+    assert Record.query.filter_by(currency_id=bitcoin.id).order_by(Record.date).first().close == 200
+
+# Test for streaming files in fixed-size chunks, skipping rows with an invalid date
+def test_read_files_and_upload_streaming(app, csv_folder):
+    with open(csv_folder / 'coin_Bitcoin.csv', 'a') as file:
+        file.write('41,Bitcoin,BTC,not-a-date,1,1,1,1,1,1\n')
+
+    app.config['INGEST_CHUNK_SIZE'] = 7
+    read_files_and_upload(app, str(csv_folder))
+
+    assert Record.query.count() == 2 * 40
+    assert db.session.get(IngestFile, 'coin_Ethereum.csv').last_date == datetime(2021, 2, 9)
+
+# Test for skipping a file without data rows, in chunks or whole
+@pytest.mark.parametrize('chunk_size', [0, 7])
+def test_read_files_and_upload_empty_file(app, csv_folder, chunk_size):
+    (csv_folder / 'coin_Empty.csv').write_text(f'Empty historical prices\n{CSV_HEADER}\n')
+    app.config['INGEST_CHUNK_SIZE'] = chunk_size
+    read_files_and_upload(app, str(csv_folder))
+
+    assert Record.query.count() == 2 * 40
+    assert db.session.get(IngestFile, 'coin_Empty.csv') is None
+
+# Test for rolling back a failed upload and reporting it to the caller
+def test_read_files_and_upload_failure(app, csv_folder, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('write failed')
+    monkeypatch.setattr('utilities.helper.write_records', fail)
+
+    with pytest.raises(RuntimeError, match='write failed'):
+        read_files_and_upload(app, str(csv_folder))
+    assert Currency.query.count() == 0
+
+# Test for regenerating the dashboard snapshot after an ingest
+def test_read_files_and_upload_snapshot_file(app, csv_folder, tmp_path):
+    snapshot_path = str(tmp_path / 'dashboard.snapshot')
+    app.config['DASHBOARD_SNAPSHOT'] = snapshot_path
+    read_files_and_upload(app, str(csv_folder))
+
+    currencies, columns = read_snapshot(snapshot_path)
+    assert sorted(symbol for _, symbol in currencies) == ['BTC', 'ETH']
+    assert len(columns['close']) == 2 * 40
+
+# Test for reporting readiness only once the bootstrap has loaded the data
+def test_bootstrap_command(app, csv_folder):
+    client = app.test_client()
+    assert client.get('/readyz').status_code == 503
+
+    read_files_and_upload(app, str(csv_folder))
+    result = app.test_cli_runner().invoke(args=['bootstrap'])
+    assert result.exit_code == 0
+    assert 'Bootstrap ready' in result.output
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json['bootstrap']['stage'] == 'ready'
+
+# Test for replacing the records of one currency without touching the others
+def test_replace_currency_command(app, csv_folder, tmp_path):
+    read_files_and_upload(app, str(csv_folder))
+    ethereum = Currency.query.filter_by(symbol='ETH').one()
+    ethereum_records = [(record.date, record.close) for record in Record.query.filter_by(currency_id=ethereum.id).order_by(Record.date)]
+
+    replacement = tmp_path / 'coin_Bitcoin_fixed.csv'
+    write_csv(replacement, 'Bitcoin', 'BTC', datetime(2021, 1, 11), 35, 300)
+    result = app.test_cli_runner().invoke(args=['replace-currency', str(replacement)])
+    assert result.exit_code == 0
+    assert 'Replaced the records of Bitcoin with 35 records' in result.output
+
+    bitcoin = Currency.query.filter_by(symbol='BTC').one()
+    records = Record.query.filter_by(currency_id=bitcoin.id).order_by(Record.date).all()
+    assert len(records) == 35
+    assert (records[0].date, records[0].close) == (date(2021, 1, 11), 300)
+    assert [(record.date, record.close) for record in Record.query.filter_by(currency_id=ethereum.id).order_by(Record.date)] == ethereum_records
+
+    # The manifest, coverage and daily snapshot of the currency follow the new records
+    entries = IngestFile.query.filter_by(currency_id=bitcoin.id).order_by(IngestFile.name).all()
+    assert [(entry.name, entry.last_date) for entry in entries] == [('coin_Bitcoin.csv', datetime(2021, 2, 14)), ('coin_Bitcoin_fixed.csv', datetime(2021, 2, 14))]
+    assert db.session.get(Coverage, bitcoin.id).ranges == '[["2021-01-11", "2021-02-14"]]'
+    metric = db.session.get(DailyMetric, (datetime(2021, 2, 15).date(), bitcoin.id))
+    assert metric.close == 334 and metric.full_window
+    assert db.session.get(DailyMetric, (datetime(2021, 2, 10).date(), ethereum.id)).full_window
+
+    # So does the market rollup, on the days of the old and the new records
+    assert (db.session.get(MarketMetric, date(2021, 1, 5)).currencies, db.session.get(MarketMetric, date(2021, 1, 5)).leader_id) == (1, ethereum.id)
+    assert db.session.get(MarketMetric, date(2021, 2, 14)).total_marketcap == 33400
+
+# Test for not loading the replaced file again, even when it has days after the new records
+def test_replace_currency_then_ingest(app, csv_folder, tmp_path_factory):
+    read_files_and_upload(app, str(csv_folder))
+
+    replacement = tmp_path_factory.mktemp('fixed') / 'coin_Bitcoin.csv'
+    write_csv(replacement, 'Bitcoin', 'BTC', datetime(2021, 1, 11), 10, 300)
+    assert app.test_cli_runner().invoke(args=['replace-currency', str(replacement)]).exit_code == 0
+
+    read_files_and_upload(app, str(csv_folder))
+    bitcoin = Currency.query.filter_by(symbol='BTC').one()
+    records = Record.query.filter_by(currency_id=bitcoin.id).order_by(Record.date).all()
+    assert (records[0].date, records[-1].date, len(records)) == (date(2021, 1, 11), date(2021, 1, 20), 10)
+    assert {record.close for record in records} == set(range(300, 310))
+
+# Test for keeping the records and exiting with an error when the replacement fails
+def test_replace_currency_failure(app, csv_folder, tmp_path, monkeypatch):
+    read_files_and_upload(app, str(csv_folder))
+
+    def fail(*args):
+        raise RuntimeError("Connection lost")
+    monkeypatch.setattr('utilities.helper.write_records', fail)
+
+    replacement = tmp_path / 'coin_Bitcoin_fixed.csv'
+    write_csv(replacement, 'Bitcoin', 'BTC', datetime(2021, 1, 11), 35, 300)
+    result = app.test_cli_runner().invoke(args=['replace-currency', str(replacement)])
+    assert result.exit_code != 0
+    assert 'Connection lost' in result.output
+
+    bitcoin = Currency.query.filter_by(symbol='BTC').one()
+    assert Record.query.filter_by(currency_id=bitcoin.id).count() == 40
+    assert db.session.get(Coverage, bitcoin.id) is not None
+    assert [entry.name for entry in IngestFile.query.filter_by(currency_id=bitcoin.id)] == ['coin_Bitcoin.csv']
+
+    # A file without data rows fails the command as well
+    empty = tmp_path / 'coin_Empty.csv'
+    write_csv(empty, 'Empty', 'EMP', datetime(2021, 1, 1), 0, 100)
+    result = app.test_cli_runner().invoke(args=['replace-currency', str(empty)])
+    assert result.exit_code != 0
+    assert 'has no records' in result.output
+
+# Test for loading a blank market cap as null, which the dashboard orders last in either order
+@pytest.mark.parametrize('dashboard_store', ['sql', 'memory'])
+def test_blank_market_cap(app, csv_folder, dashboard_store):
+    path = csv_folder / 'coin_Bitcoin.csv'
+    lines = path.read_text().splitlines()
+    lines[-1] = lines[-1].rsplit(',', 1)[0] + ','
+    path.write_text('\n'.join(lines) + '\n')
+    read_files_and_upload(app, str(csv_folder))
+    assert Record.query.filter_by(marketcap=None).count() == 1
+
+    if dashboard_store == 'memory':
+        store.load()
+    app.config['DASHBOARD_STORE'] = dashboard_store
+    client = app.test_client()
+    for order_type in ['asc', 'desc']:
+        url = f'/dashboard?id=all&date=2021-02-10&order_by=market-cap&order_type={order_type}'
+        response = client.get(url)
+        assert response.status_code == 200
+        assert [(entry['symbol'], entry['market-cap']) for entry in response.json] == [('ETH', 8900), ('BTC', None)]
+        assert [entry['symbol'] for entry in client.get(f'{url}&limit=1').json['data']] == ['ETH']
+
+# Test for removing every currency and record at once
+def test_reset_data_command(app, csv_folder):
+    read_files_and_upload(app, str(csv_folder))
+    result = app.test_cli_runner().invoke(args=['reset-data', '--yes'])
+    assert result.exit_code == 0
+    assert 'All currencies and associated records have been removed' in result.output
+    assert [model.query.count() for model in [Currency, Record, DailyMetric, MarketMetric, IngestFile, Coverage]] == [0, 0, 0, 0, 0, 0]
+    assert app.extensions['search_index'].find('btc') is None
+
+# Test for exiting with an error when the data cannot be removed
+def test_reset_data_command_failure(app, csv_folder, monkeypatch):
+    read_files_and_upload(app, str(csv_folder))
+
+    def fail():
+        raise RuntimeError("Connection lost")
+    monkeypatch.setattr('utilities.helper.refresh_serving_data', fail)
+
+    result = app.test_cli_runner().invoke(args=['reset-data', '--yes'])
+    assert result.exit_code != 0
+    assert 'Connection lost' in result.output
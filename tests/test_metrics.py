@@ -0,0 +1,57 @@
+# tests/test_metrics.py
+
+import pytest
+from config.settings import TestConfig
+from app.models import Currency
+from app.metrics import Histogram
+from app import create_app, db
+
+# Fixture to create a Flask app with one currency for each metrics test
+@pytest.fixture()
+def app():
+    app = create_app(TestConfig())
+    with app.app_context():
+        db.create_all()
+        db.session.add(Currency(name='Bitcoin', symbol='BTC'))
+        db.session.commit()
+        yield app
+
+# Test for counting observations in cumulative buckets
+def test_histogram():
+    histogram = Histogram((0.1, 1.0))
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+    assert histogram.cumulative() == [2, 3, 4]
+    assert histogram.sum == pytest.approx(2.65)
+
+# Test for exposing the latency, SQL statements and cache counters of the requests
+def test_metrics_endpoint(app):
+    client = app.test_client()
+    client.get('/dashboard?id=btc&date=1999-10-23&order_by=price&order_type=asc')
+    client.get('/dashboard?id=btc&date=1999-10-23&order_by=price&order_type=asc')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    lines = response.get_data(as_text=True).splitlines()
+    assert 'krispyto_requests_total{endpoint="/dashboard",method="GET",status="404"} 2' in lines
+    assert 'krispyto_request_duration_seconds_count{endpoint="/dashboard"} 2' in lines
+    assert 'krispyto_request_duration_seconds_bucket{endpoint="/dashboard",le="+Inf"} 2' in lines
+    # The data version and the coverage index are read once, then the misses of the index skip the records
+    assert 'krispyto_db_statements_total{endpoint="/dashboard"} 2' in lines
+    assert 'krispyto_cache_misses_total{backend="none"} 2' in lines
+
+# Test for logging slow requests with their SQL statements
+def test_slow_request_log(app, capsys):
+    app.config['METRICS_SLOW_REQUEST_SECONDS'] = 1e-9
+    app.test_client().get('/dashboard?id=btc&date=1999-10-23&order_by=price&order_type=asc')
+    output = capsys.readouterr().out
+    assert '[Server] Slow request GET /dashboard?id=btc' in output
+    assert 'SELECT' in output
+
+# Test for leaving the requests unmeasured when the metrics are disabled
+def test_metrics_disabled(app):
+    app.config['METRICS_ENABLED'] = False
+    client = app.test_client()
+    client.get('/search?name=btc')
+    assert 'endpoint="/search"' not in client.get('/metrics').get_data(as_text=True)
@@ -0,0 +1,59 @@
+# tests/test_replicas.py
+
+import pytest
+from datetime import date
+from sqlalchemy import create_engine, insert
+from config.settings import TestConfig
+from app.models import MarketMetric
+from app import create_app, db
+
+# Creates the schema in a database file, with a market rollup day telling the databases apart
+def create_database(path, currencies):
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(MarketMetric), [{'date': date(2021, 1, 1), 'currencies': currencies}])
+    engine.dispose()
+    return f'sqlite:///{path}'
+
+# Fixture to create an app on a primary database with the given read replica URIs
+@pytest.fixture()
+def create_replicated_app(tmp_path):
+    primary = create_database(tmp_path / 'primary.db', 1)
+
+    def create(replicas):
+        class ReplicaConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = primary
+            REPLICA_DATABASE_URIS = replicas
+        return create_app(ReplicaConfig())
+    return create
+
+# Returns the number of currencies of the rollup day, which differs in each database
+def read_currencies(client):
+    return client.get('/market?start=2021-01-01&end=2021-01-01').json[0]['currencies']
+
+# Test for reading from the replicas in turn and writing to the primary
+def test_read_from_replicas(create_replicated_app, tmp_path):
+    app = create_replicated_app([create_database(tmp_path / 'replica_1.db', 2), create_database(tmp_path / 'replica_2.db', 3)])
+    client = app.test_client()
+    assert [read_currencies(client) for _ in range(4)] == [2, 3, 2, 3]
+
+    with app.app_context():
+        assert db.session.get(MarketMetric, date(2021, 1, 1)).currencies == 1
+
+# Test for skipping a failed replica, then falling back to the primary when none is left
+def test_replica_failover(create_replicated_app, tmp_path):
+    missing = f'sqlite:///{tmp_path}/missing/replica.db'
+    app = create_replicated_app([missing, create_database(tmp_path / 'replica.db', 2)])
+    client = app.test_client()
+    assert [read_currencies(client) for _ in range(3)] == [2, 2, 2]
+    assert client.get('/readyz').json['replicas'] == [{'replica': 0, 'healthy': False}, {'replica': 1, 'healthy': True}]
+
+    assert read_currencies(create_replicated_app([missing]).test_client()) == 1
+
+# Test for answering the liveness probe without connecting to a replica
+def test_liveness_probe_skips_replicas(create_replicated_app, tmp_path):
+    app = create_replicated_app([f'sqlite:///{tmp_path}/missing/replica.db'])
+    client = app.test_client()
+    assert client.get('/healthz').json == {'status': 'ok'}
+    assert app.extensions['replicas'].status() == [{'replica': 0, 'healthy': True}]
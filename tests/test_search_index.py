@@ -0,0 +1,41 @@
+# tests/test_search_index.py
+
+from config.settings import TestConfig
+from app.models import Currency
+from app.search_index import SearchIndex
+from app import create_app, db
+from utilities.helper import refresh_serving_data
+
+# Test for ranking prefix matches by their shortest matching name or symbol
+def test_search_index_complete():
+    index = SearchIndex([('Bitcoin', 'BTC'), ('Bitcoin Cash', 'BCH'), ('Binance Coin', 'BNB'), ('Aave', 'AAVE')])
+
+    assert [entry['symbol'] for entry in index.complete('b', 3)] == ['BCH', 'BNB', 'BTC']
+    assert [entry['symbol'] for entry in index.complete('BITCOIN', 10)] == ['BTC', 'BCH']
+    assert index.complete('c', 10) == []
+
+# Test for finding by name before symbol, keeping the first currency on duplicates
+def test_search_index_find():
+    index = SearchIndex([('Aave', 'AAVE'), ('BTC', 'XBT'), ('Bitcoin', 'BTC'), ('Bitcoin', 'BTC2')])
+
+    assert index.find('btc') == {'name': 'BTC', 'symbol': 'XBT'}
+    assert index.find('BITCOIN') == {'name': 'Bitcoin', 'symbol': 'BTC'}
+    assert index.find('eth') is None
+
+# Test for rebuilding the index of a worker after another process added currencies
+def test_search_index_reloaded_by_other_process(tmp_path):
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/shared.db'
+        DATA_VERSION_CHECK_SECONDS = 0
+
+    worker, ingest = create_app(SharedConfig()), create_app(SharedConfig())
+    with worker.app_context():
+        db.create_all()
+    client = worker.test_client()
+    assert client.get('/search?name=doge').status_code == 404
+
+    with ingest.app_context():
+        db.session.add(Currency(name='Dogecoin', symbol='DOGE'))
+        db.session.commit()
+        refresh_serving_data()
+    assert client.get('/search?name=doge').json == {'name': 'Dogecoin', 'symbol': 'DOGE'}
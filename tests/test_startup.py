@@ -0,0 +1,50 @@
+# tests/test_startup.py
+
+import os
+import sys
+import subprocess
+import pytest
+
+# Modules only needed by the ingestion or the in-memory store, which the API process must not import
+INGESTION_MODULES = ['pandas', 'google_drive_downloader', 'numpy']
+
+# Budgets of a cold create_app, overridable on slower machines
+IMPORT_BUDGET_MS = int(os.getenv('STARTUP_IMPORT_BUDGET_MS', 3000))
+RSS_BUDGET_MB = int(os.getenv('STARTUP_RSS_BUDGET_MB', 150))
+
+# The peak RSS is read from VmHWM, which is reset on exec, as ru_maxrss carries the parent's peak over
+STARTUP_SCRIPT = '''
+from app import create_app
+from config.settings import TestConfig
+create_app(TestConfig())
+with open('/proc/self/status') as status:
+    print(next(line.split()[1] for line in status if line.startswith('VmHWM:')))
+'''
+
+# Runs create_app in a fresh interpreter, returning the -X importtime summary and the peak RSS in MB
+def run_cold_start():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=root, capture_output=True, text=True, check=True
+    )
+
+    # Each line reads "import time: self [us] | cumulative | imported package"
+    imports = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, module = line[len('import time:'):].split('|')
+            imports[module.strip()] = int(cumulative)
+
+    # VmHWM is in kilobytes
+    return imports, int(result.stdout.split()[-1]) / 1024
+
+# Test for keeping the ingestion dependencies, the start-up time and the memory of create_app in check
+@pytest.mark.skipif(not os.path.exists('/proc/self/status'), reason="The peak RSS is read from /proc.")
+def test_create_app_cold_start():
+    imports, rss = run_cold_start()
+
+    assert not [module for module in INGESTION_MODULES if module in imports]
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5]
+    assert imports['app'] / 1000 < IMPORT_BUDGET_MS, f"Slowest imports (us): {slowest}"
+    assert rss < RSS_BUDGET_MB
@@ -0,0 +1,138 @@
+# tests/test_store.py
+
+import os
+import sys
+import asyncio
+import subprocess
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from config.settings import TestConfig
+from app.store import TimeSeriesStore, SEGMENT, write_snapshot
+from app.asgi import AsyncApp
+from app import create_app, db
+from tests.test_asgi import asgi_get
+
+# Loads 31 days of a currency into the database, then refreshes the serving data as "flask bootstrap" does
+INGEST_SCRIPT = '''
+import sys
+from datetime import date, timedelta
+from config.settings import TestConfig
+from app.models import Currency, Record
+from app import create_app, db
+from utilities.helper import refresh_coverage, refresh_serving_data
+
+class IngestConfig(TestConfig):
+    SQLALCHEMY_DATABASE_URI = sys.argv[1]
+
+with create_app(IngestConfig()).app_context():
+    currency = Currency(name=sys.argv[2], symbol=sys.argv[3])
+    db.session.add(currency)
+    db.session.flush()
+    db.session.add_all([Record(currency_id=currency.id, date=date(2021, 1, 1) + timedelta(days=i), close=100 + i) for i in range(31)])
+    db.session.commit()
+    refresh_coverage()
+    refresh_serving_data()
+'''
+
+# Builds a store of 31 daily closes per currency ending the day before end_date, the latest close being base_price
+def build_store(end_date, base_prices):
+    dates = np.array([end_date - timedelta(days=i) for i in range(31, 0, -1)], dtype='datetime64[D]').astype(np.int64)
+    close = np.concatenate([base_price + np.arange(30, -1, -1, dtype=np.float64) for base_price in base_prices])
+    store = TimeSeriesStore()
+    store.set_columns(
+        [(f'Coin {i}', f'C{i}') for i in range(len(base_prices))],
+        offsets=np.arange(len(base_prices) + 1, dtype=np.int64) * 31,
+        keys=np.concatenate([position * SEGMENT + dates for position in range(len(base_prices))]),
+        close=close,
+        volume=close * 10,
+        marketcap=close * 100
+    )
+    return store
+
+# Test for serving the same dashboard from a memory-mapped snapshot
+def test_snapshot_round_trip(tmp_path):
+    end_date = datetime(2021, 6, 1)
+    source = build_store(end_date, [100, 50, 75])
+    path = str(tmp_path / 'dashboard.snapshot')
+    write_snapshot(source, path)
+
+    mapped = TimeSeriesStore()
+    mapped.load_snapshot(path)
+    assert isinstance(mapped.close.base, np.memmap)
+    assert mapped.currencies == source.currencies
+    assert list(mapped.offsets) == [0, 31, 62, 93]
+
+    dashboard = mapped.dashboard(None, '2021-06-01', 'price', 'desc')
+    assert dashboard == source.dashboard(None, '2021-06-01', 'price', 'desc')
+    assert [entry['symbol'] for entry in dashboard] == ['C0', 'C2', 'C1']
+    assert dashboard[0]['24h'] == (100 - 101) / 101 * 100
+
+# Test for picking up a snapshot swapped in by another process
+def test_snapshot_swap(tmp_path):
+    end_date = datetime(2021, 6, 1)
+    path = str(tmp_path / 'dashboard.snapshot')
+    write_snapshot(build_store(end_date, [100]), path)
+
+    mapped = TimeSeriesStore()
+    mapped.load_snapshot(path)
+    assert mapped.dashboard(['c0'], '2021-06-01', 'price', 'asc')[0]['price'] == 100
+
+    write_snapshot(build_store(end_date, [200, 300]), path)
+    dashboard = mapped.dashboard(None, '2021-06-01', 'price', 'asc')
+    assert [entry['price'] for entry in dashboard] == [200, 300]
+
+# Test for ordering only the leading entries, which must match the full order including ties
+def test_dashboard_limit():
+    store = build_store(datetime(2021, 6, 1), [100, 50, 75, 50, 100, 20])
+    for order_type in ['asc', 'desc']:
+        for order_by in ['price', 'crypto']:
+            dashboard = store.dashboard(None, '2021-06-01', order_by, order_type)
+            for limit in range(1, 8):
+                assert store.dashboard(None, '2021-06-01', order_by, order_type, limit) == dashboard[:limit]
+
+# Test for ordering the blank market caps last, with or without a limit
+def test_dashboard_missing_values():
+    store = build_store(datetime(2021, 6, 1), [100, 50, 75, 20])
+    store.marketcap = store.marketcap.copy()
+    store.marketcap[[30, 92]] = np.nan
+    for order_type in ['asc', 'desc']:
+        dashboard = store.dashboard(None, '2021-06-01', 'market-cap', order_type)
+        assert [entry['market-cap'] for entry in dashboard[2:]] == [None, None]
+        for limit in range(1, 6):
+            assert store.dashboard(None, '2021-06-01', 'market-cap', order_type, limit) == dashboard[:limit]
+
+# Test for reloading the store of the Flask and ASGI apps after an ingest in another process
+def test_store_reloaded_after_other_process_ingest(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'shared.db'}"
+    engine = create_engine(uri)
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    class WorkerConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+        DASHBOARD_STORE = 'memory'
+        DATA_VERSION_CHECK_SECONDS = 0
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def ingest(name, symbol):
+        subprocess.run([sys.executable, '-c', INGEST_SCRIPT, uri, name, symbol], cwd=root, check=True, capture_output=True)
+
+    client, asgi_app = create_app(WorkerConfig()).test_client(), AsyncApp(WorkerConfig)
+    query_string = 'date=2021-02-01&order_by=price&order_type=asc'
+
+    async def asgi_dashboard(crypto_id):
+        status, _ = await asgi_get(asgi_app, '/dashboard', f'id={crypto_id}&{query_string}')
+        return status
+
+    assert client.get(f'/dashboard?id=btc&{query_string}').status_code == 404
+    assert asyncio.run(asgi_dashboard('btc')) == 404
+
+    ingest('Bitcoin', 'BTC')
+    response = client.get(f'/dashboard?id=btc&{query_string}')
+    assert response.status_code == 200
+    assert response.json[0]['price'] == 130
+
+    ingest('Ethereum', 'ETH')
+    assert asyncio.run(asgi_dashboard('eth')) == 200
+    asyncio.run(asgi_app.engine.dispose())
@@ -1,15 +1,26 @@
 # utils/helper.py
 
+import io
 import os
+import hashlib
 import zipfile
-import pandas as pd
-from google_drive_downloader import GoogleDriveDownloader as gdd
-from sqlalchemy import text, inspect, create_engine
-from datetime import datetime
-from app.models import db, Currency, Record
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from sqlalchemy import text, inspect, create_engine, func, insert, select, delete, case, cast, literal, and_, true, Date
+from datetime import date, datetime, timedelta
+from flask import current_app
+from app.models import db, Currency, Record, DailyMetric, MarketMetric, IngestFile, Coverage
+from app.cache import invalidate_cache
+from app.data_version import bump_data_version
+from app.coverage import merge_ranges, encode_ranges, decode_ranges, rebuild_coverage_index
+from app.metrics import get_metrics
+from app.search_index import rebuild_search_index
 
 # Download the zip file from Google Drive
 def download_and_extract_zip(file_id, dest_path):
+    # Imported here so only a download pays for the downloader
+    from google_drive_downloader import GoogleDriveDownloader as gdd
+
     print("[Server] Data downloading")
     zip_file_path = dest_path + 'crypto.zip'
 
@@ -26,51 +37,253 @@ def download_and_extract_zip(file_id, dest_path):
 
     print("[Server] Files download completed")
 
-# Read downloaded file and upload to database
-def read_files_and_upload(app, src_path):
-    try:
-        with app.app_context():
-            # Iterate through each file in the specified directory
-            for filename in os.listdir(src_path):
-                file_path = os.path.join(src_path, filename)
-
-                # Read the CSV file into a DataFrame, skipping the first row
-                df = pd.read_csv(file_path, delimiter=',', skiprows=1)
-                currency_name = df.iloc[0, 1]  # Assuming the currency name is in the second column
-                currency_symbol = df.iloc[0, 2]  # Assuming the currency symbol is in the third column
-
-                # Add currency
-                currency = db.session.query(Currency).filter_by(name=currency_name).first()
-                if not currency:
-                    currency = Currency(name=currency_name, symbol=currency_symbol)
-                    db.session.add(currency)
-                    db.session.commit()
-
-                for index, row in df.iterrows():
-                    # Create a Record and associate it with the corresponding currency
-                    record = Record(
-                        currency_id=currency.id,
-                        date=datetime.strptime(row.iloc[3], '%Y-%m-%d %H:%M:%S'),
-                        high=float(row.iloc[4]),
-                        low=float(row.iloc[5]),
-                        open=float(row.iloc[6]),
-                        close=float(row.iloc[7]),
-                        volume=float(row.iloc[8]),
-                        marketcap=float(row.iloc[9])
-                    )
-
-                    # Add the record to the session
-                    db.session.add(record)
-
-            # Commit changes to the database after processing all files
+# Columns of the record values, in the order they follow the date in the CSV files
+RECORD_COLUMNS = ['high', 'low', 'open', 'close', 'volume', 'marketcap']
+
+# Reads a CSV file, skipping the first row, in chunks of chunk_size rows (whole when 0)
+def read_chunks(file_path, chunk_size):
+    # Imported here so only an ingest pays for pandas
+    import pandas as pd
+
+    if chunk_size:
+        yield from pd.read_csv(file_path, delimiter=',', skiprows=1, chunksize=chunk_size)
+    else:
+        yield pd.read_csv(file_path, delimiter=',', skiprows=1)
+
+# Converts raw CSV chunks into their currency name, symbol and a DataFrame of typed record columns
+def parse_chunks(chunks):
+    import pandas as pd
+
+    for df in chunks:
+        # A file without data rows has no currency to read
+        if df.empty:
+            continue
+
+        currency_name = df.iloc[0, 1]  # Assuming the currency name is in the second column
+        currency_symbol = df.iloc[0, 2]  # Assuming the currency symbol is in the third column
+
+        # Convert whole columns at once instead of cell by cell
+        records = pd.DataFrame({'date': pd.to_datetime(df.iloc[:, 3], format='%Y-%m-%d %H:%M:%S', errors='coerce')})
+        for offset, column in enumerate(RECORD_COLUMNS, start=4):
+            records[column] = pd.to_numeric(df.iloc[:, offset], errors='coerce').astype('float64')
+
+        yield currency_name, currency_symbol, records
+
+# Drops the rows whose date could not be parsed or without a close, and truncates the dates to their day
+def validate_chunks(parsed_chunks):
+    for currency_name, currency_symbol, records in parsed_chunks:
+        invalid = records['date'].isna() | records['close'].isna()
+        if invalid.any():
+            print(f"[Server] Skipped {invalid.sum()} rows of {currency_name} with an invalid date or close.")
+        records = records[~invalid]
+        yield currency_name, currency_symbol, records.assign(date=records['date'].dt.normalize())
+
+# Parses a whole CSV file into its currency name, symbol and a DataFrame of typed record columns (None without data rows)
+def parse_file(file_path):
+    return next(validate_chunks(parse_chunks(read_chunks(file_path, 0))), None)
+
+# Parses the CSV files in order, across a process pool when there are several workers
+def parse_files(file_paths, workers):
+    if workers > 1 and len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(parse_file, file_paths)
+    else:
+        yield from map(parse_file, file_paths)
+
+# Calculates the SHA-256 hash of a file's content
+def hash_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Builds an INSERT updating the existing row on a (currency_id, date) conflict
+def upsert_statement(dialect_name):
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        # Other databases rely on the checkpoint alone
+        return insert(Record)
+
+    statement = dialect_insert(Record)
+    return statement.on_conflict_do_update(
+        index_elements=['currency_id', 'date'],
+        set_={column: statement.excluded[column] for column in RECORD_COLUMNS}
+    )
+
+# Creates the missing yearly partitions of the record table for the dates, if the table is partitioned (PostgreSQL)
+def ensure_record_partitions(connection, first_date, last_date):
+    partitioned = connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'record'::regclass)"
+    )).scalar()
+    if not partitioned:
+        return
+
+    for year in range(first_date.year, last_date.year + 1):
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS record_y{year} PARTITION OF record "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        ))
+
+# Upserts the records of a currency in batches, staged with COPY on PostgreSQL and executemany otherwise
+def write_records(currency_id, records, batch_size):
+    records = records.assign(currency_id=currency_id, date=records['date'].dt.date)[['currency_id', 'date'] + RECORD_COLUMNS]
+    columns = ', '.join(records.columns)
+    connection = db.session.connection()
+    cursor = connection.connection.cursor() if connection.dialect.name == 'postgresql' else None
+
+    if cursor is not None and not records.empty:
+        ensure_record_partitions(connection, records['date'].min(), records['date'].max())
+
+    if cursor is not None:
+        # COPY cannot resolve conflicts, so batches go through a staging table first
+        cursor.execute(f"CREATE TEMPORARY TABLE IF NOT EXISTS record_staging AS SELECT {columns} FROM record WITH NO DATA")
+    else:
+        statement = upsert_statement(connection.dialect.name)
+
+    for start in range(0, len(records), batch_size):
+        batch = records.iloc[start:start + batch_size]
+
+        if cursor is not None:
+            buffer = io.StringIO()
+            batch.to_csv(buffer, index=False, header=False)
+            copy_statement = f"COPY record_staging ({columns}) FROM STDIN WITH (FORMAT csv)"
+
+            if hasattr(cursor, 'copy_expert'):
+                # psycopg2
+                buffer.seek(0)
+                cursor.copy_expert(copy_statement, buffer)
+            else:
+                # psycopg 3
+                with cursor.copy(copy_statement) as copy:
+                    copy.write(buffer.getvalue())
+
+            updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in RECORD_COLUMNS)
+            cursor.execute(
+                f"INSERT INTO record ({columns}) SELECT {columns} FROM record_staging "
+                f"ON CONFLICT (currency_id, date) DO UPDATE SET {updates}"
+            )
+            cursor.execute("TRUNCATE record_staging")
+        else:
+            db.session.execute(statement, batch.to_dict('records'))
+
+# Read downloaded file and upload to database, skipping files and rows that were already loaded
+# (progress is called with the number of files done and the total after each file)
+def read_files_and_upload(app, src_path, progress=None):
+    with app.app_context():
+        try:
+            started = perf_counter()
+            batch_size = app.config['INGEST_BATCH_SIZE']
+            workers = app.config['INGEST_WORKERS'] or os.cpu_count() or 1
+
+            # Only parse the files that are new or whose content changed since the last run
+            manifest = {entry.name: entry for entry in IngestFile.query.all()}
+            file_hashes = {}
+            for filename in sorted(os.listdir(src_path)):
+                content_hash = hash_file(os.path.join(src_path, filename))
+                entry = manifest.get(filename)
+                if entry is None or entry.content_hash != content_hash:
+                    file_hashes[filename] = content_hash
+
+            if not file_hashes:
+                print("[Server] All files are up to date.")
+                return
+
+            file_paths = [os.path.join(src_path, filename) for filename in file_hashes]
+
+            # Stream each file in fixed-size chunks, or parse whole files across the process pool
+            chunk_size = app.config['INGEST_CHUNK_SIZE']
+            if chunk_size:
+                files = ((filename, validate_chunks(parse_chunks(read_chunks(file_path, chunk_size))))
+                         for filename, file_path in zip(file_hashes, file_paths))
+            else:
+                files = zip(file_hashes, ([parsed] if parsed is not None else [] for parsed in parse_files(file_paths, workers)))
+
+            # Earliest date loaded, from which the daily snapshot has to be rebuilt, and the days loaded per currency
+            first_date = None
+            row_count = 0
+            loaded_days = {}
+
+            for files_done, (filename, chunks) in enumerate(files, start=1):
+                currency = None
+
+                for currency_name, currency_symbol, records in chunks:
+                    # Resolve the currency and its checkpoint from the first chunk
+                    if currency is None:
+                        currency = db.session.query(Currency).filter_by(name=currency_name).first()
+                        if not currency:
+                            currency = Currency(name=currency_name, symbol=currency_symbol)
+                            db.session.add(currency)
+                            db.session.flush()
+
+                        checkpoint = db.session.query(func.max(IngestFile.last_date)).filter_by(currency_id=currency.id).scalar()
+                        last_date = checkpoint
+
+                    # Keep only the rows newer than the currency's checkpoint, one per date
+                    if checkpoint is not None:
+                        records = records[records['date'] > checkpoint]
+                    records = records.drop_duplicates('date', keep='last')
+
+                    if records.empty:
+                        continue
+
+                    write_records(currency.id, records, batch_size)
+                    row_count += len(records)
+                    loaded_days.setdefault(currency.id, set()).update(day.toordinal() for day in records['date'].dt.date.unique())
+
+                    chunk_first_date = records['date'].min().to_pydatetime()
+                    if first_date is None or chunk_first_date < first_date:
+                        first_date = chunk_first_date
+
+                    chunk_last_date = records['date'].max().to_pydatetime()
+                    last_date = chunk_last_date if last_date is None else max(last_date, chunk_last_date)
+
+                # Skip a file without data rows, which names no currency
+                if currency is None:
+                    print(f"[Server] Skipped {filename}, which has no records.")
+                    if progress:
+                        progress(files_done, len(file_paths))
+                    continue
+
+                # Record the file in the manifest
+                db.session.merge(IngestFile(
+                    name=filename,
+                    content_hash=file_hashes[filename],
+                    currency_id=currency.id,
+                    last_date=last_date,
+                    ingested_at=datetime.utcnow()
+                ))
+
+                if progress:
+                    progress(files_done, len(file_paths))
+
+            # Add the loaded days to the coverage, then commit changes to the database after processing all files
+            update_coverage(loaded_days)
             db.session.commit()
 
+            elapsed = perf_counter() - started
+            get_metrics().observe_ingest(row_count, elapsed)
+            print(f"[Server] Uploaded {row_count} records from {len(file_paths)} files in {elapsed:.1f}s "
+                  f"({row_count / elapsed if elapsed else 0:.0f} rows/s).")
+
+            # Update the daily snapshot for the days affected by the new records
+            if first_date is not None:
+                refresh_daily_metrics(first_date.date())
+                refresh_market_metrics(first_date.date())
+
+            refresh_serving_data()
+
             print("[Server] Data has been uploaded successfully.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+        except Exception:
+            # Drop the partial upload so the session stays usable, and let the caller report the failure
+            db.session.rollback()
+            raise
 
-# Inspecting the database
-def inspect_database(app):
+# Inspecting the database, reporting progress in the bootstrap status if given
+def inspect_database(app, status=None):
     print("[Server] Checking database status")
 
     with app.app_context():
@@ -86,40 +299,283 @@ def inspect_database(app):
         # Continue with other checks or actions if needed
         print("[Server] Tables found. Proceeding with other checks if needed.")
 
-        # Loop through all tables and check if each table has at least one row of data
-        for table_name in table_names:
+        # Loop through the source tables and check if each table has at least one row of data
+        # (the daily snapshot is derived from them and rebuilt below)
+        for table_name in [Currency.__tablename__, Record.__tablename__]:
             query = text(f"SELECT 1 FROM {table_name} LIMIT 1")
             query_result = db.session.execute(query).fetchone()
             if query_result is None:
                 # Download and extract the data from Google Drive
+                if status:
+                    status.update('downloading')
                 download_and_extract_zip(app.config['GOOGLE_FILE_ID'], app.config['CSV_FILE_FOLDER'])
                 # Process data
-                read_files_and_upload(app, app.config['CSV_FILE_FOLDER'])
+                if status:
+                    status.update('uploading')
+                read_files_and_upload(app, app.config['CSV_FILE_FOLDER'], progress=status.file_done if status else None)
                 break
 
+        # Catch the daily snapshot and the coverage of currencies loaded before it existed up with the records
+        if status:
+            status.update('snapshot')
+        refresh_daily_metrics()
+        refresh_market_metrics()
+        missing = db.session.scalars(
+            select(Currency.id).outerjoin(Coverage, Coverage.currency_id == Currency.id).where(Coverage.currency_id.is_(None))
+        ).all()
+        if missing:
+            refresh_coverage(missing)
+            rebuild_coverage_index()
+
     print("[Server] Inspection completed")
 
+# Removes every currency and record with one statement per table (TRUNCATE on PostgreSQL)
 def remove_all_data():
     try:
-        # Query all currencies
-        currencies = Currency.query.all()
-
-        # Delete each currency along with associated records
-        for currency in currencies:
-            # Query records associated with the current currency
-            records_to_remove = Record.query.filter_by(currency_id=currency.id).all()
-
-            # Delete each record
-            for record in records_to_remove:
-                db.session.delete(record)
-
-            # Delete the currency itself
-            db.session.delete(currency)
+        # Tables referencing the currencies come first
+        tables = [DailyMetric, MarketMetric, Coverage, IngestFile, Record, Currency]
+        if db.session.connection().dialect.name == 'postgresql':
+            table_names = ', '.join(model.__tablename__ for model in tables)
+            db.session.execute(text(f"TRUNCATE {table_names} RESTART IDENTITY"))
+        else:
+            for model in tables:
+                db.session.execute(delete(model))
 
         # Commit changes to the database
         db.session.commit()
 
+        refresh_serving_data()
+
         print("[Server] All currencies and associated records have been removed.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    except Exception:
+        # Keep the data as it was, and let the caller report the failure
+        db.session.rollback()
+        raise
+
+# Replaces every record of the currency of a CSV file in one transaction, leaving the other currencies untouched
+def replace_currency(app, file_path):
+    with app.app_context():
+        try:
+            parsed = parse_file(file_path)
+            if parsed is None:
+                raise ValueError(f"{file_path} has no records.")
+            currency_name, currency_symbol, records = parsed
+            records = records.drop_duplicates('date', keep='last')
+
+            currency = db.session.query(Currency).filter_by(name=currency_name).first()
+            if not currency:
+                currency = Currency(name=currency_name, symbol=currency_symbol)
+                db.session.add(currency)
+                db.session.flush()
+
+            # The market rollup changes from the first day of the old or the new records
+            first_dates = [db.session.query(func.min(Record.date)).filter_by(currency_id=currency.id).scalar()]
+            if not records.empty:
+                first_dates.append(records['date'].min().date())
+            since = min((day for day in first_dates if day is not None), default=None)
+
+            # Drop the currency's rows with set-based deletes, then load the new records
+            for model in [DailyMetric, Coverage, Record]:
+                db.session.execute(delete(model).where(model.currency_id == currency.id))
+            write_records(currency.id, records, app.config['INGEST_BATCH_SIZE'])
+
+            # Keep the replaced files marked as ingested, with their hash, so the next ingestion does not
+            # load them over the new records, and move the checkpoint of the currency to the new last date
+            last_date = records['date'].max().to_pydatetime() if not records.empty else None
+            ingested_at = datetime.utcnow()
+            entries = IngestFile.query.filter_by(currency_id=currency.id).all()
+            for entry in entries:
+                entry.last_date = last_date
+                entry.ingested_at = ingested_at
+
+            # Record the file in the manifest, unless it is one of them, and the days in the coverage
+            name = os.path.basename(file_path)
+            if name not in {entry.name for entry in entries}:
+                db.session.merge(IngestFile(
+                    name=name,
+                    content_hash=hash_file(file_path),
+                    currency_id=currency.id,
+                    last_date=last_date,
+                    ingested_at=ingested_at
+                ))
+            if not records.empty:
+                update_coverage({currency.id: {day.toordinal() for day in records['date'].dt.date.unique()}})
+
+            # Commit the swap at once, so readers see either the old or the new records
+            db.session.commit()
+            print(f"[Server] Replaced the records of {currency_name} with {len(records)} records.")
+
+            refresh_daily_metrics(currency=currency)
+            if since is not None:
+                refresh_market_metrics(since)
+            refresh_serving_data()
+        except Exception:
+            # Keep the old records, and let the caller report the failure
+            db.session.rollback()
+            raise
+
+# Rebuilds the daily dashboard snapshot from the given day onwards (from the last snapshot day when omitted),
+# of every currency or only of the given one
+def refresh_daily_metrics(since=None, currency=None):
+    record_dates = db.session.query(func.min(Record.date), func.max(Record.date))
+    metrics_query = DailyMetric.query
+    if currency is not None:
+        record_dates = record_dates.filter(Record.currency_id == currency.id)
+        metrics_query = metrics_query.filter(DailyMetric.currency_id == currency.id)
+
+    first_date, last_date = record_dates.one()
+    if last_date is None:
+        return
+
+    if since is None:
+        since = metrics_query.with_entities(func.max(DailyMetric.date)).scalar() or first_date
+    since = max(since, first_date)
+
+    # A dashboard day covers the 30 days before it, so the day after the last record still has a window
+    metrics_query.filter(DailyMetric.date >= since).delete()
+    until = last_date + timedelta(days=1)
+    if since <= until:
+        columns = ['date', 'currency_id', 'close', 'change_24h', 'change_7d', 'change_1m', 'volume', 'marketcap', 'full_window']
+        query = daily_metrics_query(since, until, currency.id if currency is not None else None, db.session.connection().dialect.name)
+        db.session.execute(insert(DailyMetric).from_select(columns, query))
+    db.session.commit()
+
+    print(f"[Server] Daily snapshot has been refreshed from {since}.")
+
+# Shifts a date expression by a number of days (SQLite stores the dates as ISO strings)
+def add_days(expression, days, dialect_name):
+    if dialect_name == 'sqlite':
+        return func.date(expression, f'{days:+d} days')
+    return expression + days
+
+# Builds the query computing the dashboard rows of every day from since to until at once, as the dashboard
+# query does for one day: each day is joined with the records of its 30-day window, on the record key
+def daily_metrics_query(since, until, currency_id, dialect_name):
+    # Days of the range, the first one typed so that PostgreSQL adds days to a date rather than to text
+    first_day = literal(since, Date) if dialect_name == 'sqlite' else cast(literal(since, Date), Date)
+    days = select(first_day.label('day')).cte('days', recursive=True)
+    days = days.union_all(select(add_days(days.c.day, 1, dialect_name)).where(days.c.day < until))
+
+    currencies = select(Currency.id.label('currency_id'))
+    if currency_id is not None:
+        currencies = currencies.where(Currency.id == currency_id)
+    currencies = currencies.subquery()
+
+    # Rank the records of each day's window per currency, ordered by date
+    partition = [days.c.day, Record.currency_id]
+    window = {'partition_by': partition, 'order_by': Record.date}
+    ranked = select(
+        days.c.day.label('date'),
+        Record.currency_id.label('currency_id'),
+        Record.close.label('close'),
+        Record.volume.label('volume'),
+        Record.marketcap.label('marketcap'),
+        func.lag(Record.close, 1).over(**window).label('close_24h'),
+        func.lag(Record.close, 7).over(**window).label('close_7d'),
+        func.first_value(Record.close).over(**window).label('close_1m'),
+        func.count().over(partition_by=partition).label('records'),
+        func.row_number().over(partition_by=partition, order_by=Record.date.desc()).label('position')
+    ).select_from(days).join(currencies, true()).join(Record, and_(
+        Record.currency_id == currencies.c.currency_id,
+        Record.date >= add_days(days.c.day, -30, dialect_name),
+        Record.date < days.c.day
+    )).subquery()
+
+    # Calculate a percentage change against a previous close, NULL when it is zero
+    def change(previous):
+        return (ranked.c.close - previous) / func.nullif(previous, 0) * 100
+
+    # Keep the latest record of each day and currency
+    return select(
+        ranked.c.date,
+        ranked.c.currency_id,
+        ranked.c.close,
+        change(ranked.c.close_24h),
+        change(ranked.c.close_7d),
+        change(ranked.c.close_1m),
+        ranked.c.volume,
+        ranked.c.marketcap,
+        ranked.c.records >= 30
+    ).where(ranked.c.position == 1)
+
+# Builds the query aggregating the records of each day from since onwards into the market rollup columns
+def market_query(since, top_n):
+    # Rank the currencies of each day by market cap, those without one last
+    ranked = select(
+        Record.date.label('date'),
+        Record.currency_id.label('currency_id'),
+        Record.marketcap.label('marketcap'),
+        Record.volume.label('volume'),
+        func.row_number().over(partition_by=Record.date, order_by=Record.marketcap.desc().nulls_last()).label('position')
+    ).where(Record.date >= since).subquery()
+
+    return select(
+        ranked.c.date,
+        func.sum(ranked.c.marketcap),
+        func.sum(ranked.c.volume),
+        func.count(),
+        func.sum(case((ranked.c.position <= top_n, ranked.c.marketcap))),
+        func.max(case((ranked.c.position == 1, ranked.c.currency_id))),
+        func.max(case((ranked.c.position == 1, ranked.c.marketcap)))
+    ).group_by(ranked.c.date)
+
+# Rebuilds the market rollup from the given day onwards (from the last rollup day when omitted)
+# with one set-based INSERT ... SELECT
+def refresh_market_metrics(since=None):
+    first_date = db.session.query(func.min(Record.date)).scalar()
+    if first_date is None:
+        return
+
+    if since is None:
+        since = db.session.query(func.max(MarketMetric.date)).scalar() or first_date
+
+    MarketMetric.query.filter(MarketMetric.date >= since).delete()
+    columns = ['date', 'total_marketcap', 'total_volume', 'currencies', 'top_marketcap', 'leader_id', 'leader_marketcap']
+    db.session.execute(insert(MarketMetric).from_select(columns, market_query(since, current_app.config['MARKET_TOP_N'])))
+    db.session.commit()
+
+    print(f"[Server] Market rollup has been refreshed from {since}.")
+
+# Merges the days (date ordinals) loaded for each currency into its coverage ranges
+def update_coverage(days_by_currency):
+    for currency_id, days in days_by_currency.items():
+        coverage = db.session.get(Coverage, currency_id)
+        ranges = merge_ranges(decode_ranges(coverage.ranges) if coverage else [], days)
+        db.session.merge(Coverage(
+            currency_id=currency_id,
+            first_date=date.fromordinal(ranges[0][0]),
+            last_date=date.fromordinal(ranges[-1][1]),
+            ranges=encode_ranges(ranges)
+        ))
+
+# Rebuilds the coverage of the given currencies (every currency when omitted) from their records
+def refresh_coverage(currency_ids=None):
+    query = select(Record.currency_id, Record.date)
+    stale = Coverage.query
+    if currency_ids is not None:
+        query = query.where(Record.currency_id.in_(currency_ids))
+        stale = stale.filter(Coverage.currency_id.in_(currency_ids))
+    stale.delete()
+
+    days_by_currency = {}
+    for currency_id, record_date in db.session.execute(query.execution_options(yield_per=10000)):
+        days_by_currency.setdefault(currency_id, set()).add(record_date.toordinal())
+    update_coverage(days_by_currency)
+    db.session.commit()
+
+    print(f"[Server] Coverage has been refreshed for {len(days_by_currency)} currencies.")
+
+# Regenerates the snapshot, reloads the in-memory store and search index, and drops the cached responses
+def refresh_serving_data():
+    from app.store import store, export_snapshot
 
+    snapshot_path = current_app.config['DASHBOARD_SNAPSHOT']
+    if snapshot_path:
+        export_snapshot(snapshot_path)
+    if store.loaded:
+        store.reload()
+    rebuild_search_index()
+    rebuild_coverage_index()
+    invalidate_cache()
+    # Let the other workers and the ASGI app drop what they derived from the old data
+    bump_data_version()